@@ -4,92 +4,87 @@ Handles CRUD operations for dataset metadata
 """
 
 import sqlite3
-from app.data.db import connect_database
+from app.data.db import execute_write, pooled_conn, retry_locked
+
+# SQL kept at module level so each call reuses the same statement text
+# (and hits sqlite3's per-connection prepared-statement cache)
+_SQL_GET_ALL_DATASETS = (
+    "SELECT dataset_id, name, source, size_mb, rows, quality_score, status "
+    "FROM datasets_metadata ORDER BY dataset_id"
+)
+_SQL_GET_DATASET = (
+    "SELECT dataset_id, name, source, size_mb, rows, quality_score, status "
+    "FROM datasets_metadata WHERE dataset_id = ?"
+)
+_SQL_INSERT_DATASET = (
+    "INSERT INTO datasets_metadata (name, source, size_mb, rows, quality_score, status) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_UPDATE_DATASET = (
+    "UPDATE datasets_metadata "
+    "SET name = ?, source = ?, size_mb = ?, rows = ?, quality_score = ?, status = ? "
+    "WHERE dataset_id = ?"
+)
+_SQL_DELETE_DATASET = "DELETE FROM datasets_metadata WHERE dataset_id = ?"
+
+def iter_all_datasets(batch=1000):
+    """
+    Yield all datasets one row at a time, fetching `batch` rows per round trip.
+
+    Only one batch is held in memory. The connection goes back to the pool
+    once the generator is exhausted or closed.
+    """
+    with pooled_conn(readonly=True) as conn:
+        cur = conn.execute(_SQL_GET_ALL_DATASETS)
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                break
+            yield from rows
 
 def get_all_datasets():
     """Retrieve all datasets from database"""
-    conn = connect_database()
-    cur = conn.cursor()
-    
-    cur.execute(
-        "SELECT dataset_id, name, source, size_mb, rows, quality_score, status "
-        "FROM datasets_metadata ORDER BY dataset_id"
-    )
-    
-    datasets = cur.fetchall()
-    conn.close()
-    
-    return datasets
+    return list(iter_all_datasets())
 
 def get_dataset_by_id(dataset_id):
-    """Retrieve a specific dataset by ID"""
-    conn = connect_database()
-    cur = conn.cursor()
-    
-    cur.execute(
-        "SELECT dataset_id, name, source, size_mb, rows, quality_score, status "
-        "FROM datasets_metadata WHERE dataset_id = ?",
-        (dataset_id,)
-    )
-    
-    dataset = cur.fetchone()
-    conn.close()
-    
-    return dataset
+    """Retrieve a specific dataset by ID (sqlite3.Row: access by index or column name)"""
+    with pooled_conn(readonly=True) as conn:
+        # Row factory on this cursor only; pooled connections stay on tuples
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur.execute(_SQL_GET_DATASET, (dataset_id,)).fetchone()
 
-def create_dataset(name, source, size_mb, rows, quality_score=0.8, status="Active"):
+def create_dataset(name, source, size_mb, rows, quality_score=0.8, status="Active", conn=None):
     """Create a new dataset entry"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute(
-            "INSERT INTO datasets_metadata (name, source, size_mb, rows, quality_score, status) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (name, source, size_mb, rows, quality_score, status)
-        )
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
+    execute_write(_SQL_INSERT_DATASET, (name, source, size_mb, rows, quality_score, status), conn)
 
-def update_dataset(dataset_id, name, source, size_mb, rows, quality_score, status):
+def insert_datasets_many(rows, conn=None):
+    """
+    Insert many datasets in a single transaction.
+
+    rows: list of (name, source, size_mb, rows, quality_score, status) tuples.
+    One commit for the whole batch instead of one per row, so bulk
+    imports are not limited by a sync per INSERT.
+
+    Returns the number of rows inserted. Pass conn to join a
+    batched_writes() transaction instead of committing here.
+    """
+    if conn is not None:
+        return conn.executemany(_SQL_INSERT_DATASET, rows).rowcount
+
+    def write():
+        with pooled_conn() as pooled, pooled:
+            return pooled.executemany(_SQL_INSERT_DATASET, rows).rowcount
+    return retry_locked(write)
+
+def update_dataset(dataset_id, name, source, size_mb, rows, quality_score, status, conn=None):
     """Update an existing dataset"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute(
-            "UPDATE datasets_metadata "
-            "SET name = ?, source = ?, size_mb = ?, rows = ?, quality_score = ?, status = ? "
-            "WHERE dataset_id = ?",
-            (name, source, size_mb, rows, quality_score, status, dataset_id)
-        )
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
+    execute_write(
+        _SQL_UPDATE_DATASET,
+        (name, source, size_mb, rows, quality_score, status, dataset_id),
+        conn
+    )
 
-def delete_dataset(dataset_id):
+def delete_dataset(dataset_id, conn=None):
     """Delete a dataset by ID"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute("DELETE FROM datasets_metadata WHERE dataset_id = ?", (dataset_id,))
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
\ No newline at end of file
+    execute_write(_SQL_DELETE_DATASET, (dataset_id,), conn)
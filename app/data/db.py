@@ -1,24 +1,359 @@
 import os
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.request import pathname2url
 
 # Path to the SQLite database stored in the DATA folder
 DB_PATH = os.path.join("DATA", "intelligence_platform.db")
 
+# Make sure the DATA directory exists (once, at import, rather than
+# stat-ing it on every connect). Ignored on a read-only filesystem.
+try:
+    os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+except OSError:
+    pass
 
-def connect_database(path: str = DB_PATH) -> sqlite3.Connection:
+# Databases already switched to WAL in this process.
+# journal_mode=WAL is persistent in the file, so it only needs setting once;
+# the other PRAGMAs are per-connection and are applied on every open.
+_WAL_ENABLED = set()
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+
+def _apply_pragmas(conn: sqlite3.Connection, path: str, readonly: bool = False) -> None:
     """
-    Create or open the SQLite database in the DATA folder.
+    Tune a fresh connection for this app's read-heavy workload.
 
-    This helper keeps all connection logic in one place.
+    - WAL lets dashboard readers run while a CRUD write is in progress
+    - synchronous=NORMAL is safe with WAL and avoids an fsync per commit
+    - bigger page cache / mmap / in-memory temp tables speed up analytics
+    - busy_timeout waits for a lock instead of failing straight away
+
+    Read-only connections cannot change the journal mode; they get
+    query_only=1 instead as a second guard against accidental writes.
     """
-    # Make sure the DATA directory exists
-    data_dir = os.path.dirname(path)
-    if data_dir and not os.path.exists(data_dir):
-        os.makedirs(data_dir, exist_ok=True)
+    if path == ":memory:":
+        return
+
+    if readonly:
+        conn.execute("PRAGMA query_only=1")
+    elif path not in _WAL_ENABLED:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _WAL_ENABLED.add(path)
 
-    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=5000")
+
+
+def _open(path: str, **kwargs) -> sqlite3.Connection:
+    """Open a tuned connection (shared by connect_database and the pool)."""
+    conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE, **kwargs)
+    _apply_pragmas(conn, path)
     # Keep the default row format (simple tuples) .
     return conn
+
+
+def _open_readonly(path: str, **kwargs) -> sqlite3.Connection:
+    """Open a tuned read-only connection (mode=ro URI)."""
+    uri = "file:" + pathname2url(os.path.abspath(path)) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE, **kwargs)
+    _apply_pragmas(conn, path, readonly=True)
+    return conn
+
+
+def connect_database(path: str = DB_PATH, row_factory=None) -> sqlite3.Connection:
+    """
+    Create or open the SQLite database in the DATA folder.
+
+    This helper keeps all connection logic in one place.
+    Pass row_factory=sqlite3.Row for keyed access (row["status"]);
+    the default stays plain tuples, which are cheapest for bulk reads.
+    """
+    conn = _open(path)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return conn
+
+
+def connect_readonly(path: str = DB_PATH) -> sqlite3.Connection:
+    """
+    Open the existing database read-only (for analytics and get_* readers).
+
+    SQLite skips write-lock handling on these connections, so dashboards
+    reading under WAL never contend with a CRUD write.
+    """
+    return _open_readonly(path)
+
+
+# --------------------------------------------------
+# Connection pool (reused by the CRUD helpers)
+# --------------------------------------------------
+POOL_SIZE = 4
+
+# SQLite allows one writer at a time anyway, so all pooled writes share a
+# single connection and queue for it here instead of on the file lock.
+WRITER_POOL_SIZE = 1
+
+# Seconds to wait for the writer connection (matches busy_timeout)
+WRITER_WAIT = 5
+
+
+class WriterBusyError(sqlite3.OperationalError):
+    """
+    The writer connection could not be borrowed.
+
+    Raised after WRITER_WAIT seconds, or straight away when the calling
+    thread already holds the writer (waiting could never succeed). Not
+    retried by retry_locked(): the wait has already happened.
+    """
+
+
+class _Pool:
+    """
+    Small pool of open connections for one database file.
+
+    Reusing connections avoids an open()/close() and a cold page cache on
+    every CRUD call. Streamlit serves each session from its own thread, so
+    pooled connections are opened with check_same_thread=False; the queue
+    makes sure only one thread uses a connection at a time.
+
+    Reader pools open extra connections when all are busy (WAL readers
+    never block each other). The writer pool never opens more than `size`;
+    callers wait for one to be returned instead.
+    """
+
+    def __init__(self, path: str, readonly: bool = False, size: int = POOL_SIZE):
+        self.path = path
+        self.readonly = readonly
+        self._idle = queue.Queue(maxsize=size)
+        self._size = size
+        self._opened = 0
+        self._lock = threading.Lock()
+        # Writer connections currently borrowed by each thread
+        self._held = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        """Borrow an idle connection, or open a new one if allowed."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        if self.readonly:
+            return _open_readonly(self.path, check_same_thread=False)
+
+        conn = self._get_writer()
+        self._held.count = getattr(self._held, "count", 0) + 1
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """Borrow or open a writer connection, waiting up to WRITER_WAIT."""
+        # A thread that already holds every writer (e.g. a write helper
+        # called inside batched_writes() without conn=) would wait for
+        # itself; fail now instead of after WRITER_WAIT
+        if getattr(self._held, "count", 0) >= self._size:
+            raise WriterBusyError(
+                "writer connection already held by this thread "
+                "(pass conn= to join its transaction)"
+            )
+
+        with self._lock:
+            can_open = self._opened < self._size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            return _open(self.path, check_same_thread=False)
+
+        try:
+            return self._idle.get(timeout=WRITER_WAIT)
+        except queue.Empty:
+            raise WriterBusyError("database is locked (writer connection busy)")
+
+    def put(self, conn: sqlite3.Connection) -> None:
+        """Give a connection back (closed instead if the pool is full)."""
+        if not self.readonly:
+            self._held.count = getattr(self._held, "count", 1) - 1
+        # Never hand a half-finished transaction to the next caller
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+# Bumped whenever a pooled connection changes rows. Cached query results
+# compare against it to know when they are stale. (PRAGMA data_version
+# cannot be used on its own here: it ignores commits made by the same
+# connection, and pooled connections are shared by every caller.)
+_write_generation = 0
+_GENERATION_LOCK = threading.Lock()
+
+
+def write_generation() -> int:
+    """Current write generation (changes after every pooled write)."""
+    return _write_generation
+
+
+def _get_pool(path: str, readonly: bool) -> _Pool:
+    with _POOLS_LOCK:
+        pool = _POOLS.get((path, readonly))
+        if pool is None:
+            size = POOL_SIZE if readonly else WRITER_POOL_SIZE
+            pool = _POOLS[(path, readonly)] = _Pool(path, readonly, size)
+        return pool
+
+
+def get_pooled(path: str = DB_PATH, readonly: bool = False) -> sqlite3.Connection:
+    """
+    Borrow a connection from the pool. Always pair with return_pooled().
+
+    readonly=True borrows from a separate pool of read-only connections.
+    """
+    return _get_pool(path, readonly).get()
+
+
+def return_pooled(conn: sqlite3.Connection, path: str = DB_PATH, readonly: bool = False) -> None:
+    """
+    Return a connection borrowed with get_pooled() (same path/readonly).
+    """
+    _get_pool(path, readonly).put(conn)
+
+
+@contextmanager
+def pooled_conn(path: str = DB_PATH, readonly: bool = False):
+    """
+    Context manager version of get_pooled()/return_pooled():
+
+        with pooled_conn() as conn:
+            ...
+    """
+    global _write_generation
+
+    conn = get_pooled(path, readonly)
+    changes_before = conn.total_changes
+    try:
+        yield conn
+    finally:
+        if conn.total_changes != changes_before:
+            with _GENERATION_LOCK:
+                _write_generation += 1
+        return_pooled(conn, path, readonly)
+
+
+# Aggregate results cache: key -> (write generation, computed at, rows).
+# Dashboards re-run the same queries on every refresh while writes are rare,
+# so results are reused until a write happens (or the TTL expires, which
+# also covers writes made by another process such as fix_database.py).
+_AGG_CACHE = {}
+_AGG_LOCK = threading.Lock()
+AGG_CACHE_TTL = 60  # seconds
+
+
+def cached_aggregate(key: str, sql: str, params=()) -> list:
+    """
+    Run an aggregate query, reusing the last result while nothing changed.
+
+    key names the result in the cache (prefix it with the module, e.g.
+    "repository.latest_incidents"); params are part of the cache key.
+    """
+    key = (key, tuple(params))
+    generation = write_generation()
+    now = time.monotonic()
+
+    with _AGG_LOCK:
+        hit = _AGG_CACHE.get(key)
+    if hit and hit[0] == generation and now - hit[1] < AGG_CACHE_TTL:
+        return hit[2]
+
+    with pooled_conn(readonly=True) as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    with _AGG_LOCK:
+        _AGG_CACHE[key] = (generation, now, rows)
+    return rows
+
+
+# Attempts made by retry_locked() before giving up
+WRITE_RETRIES = 5
+
+
+def retry_locked(fn, tries: int = WRITE_RETRIES):
+    """
+    Call fn(), retrying with exponential backoff while the database is locked.
+
+    busy_timeout already waits for the lock, but a write can still fail with
+    "database is locked" (e.g. a reader upgrading to a writer under WAL).
+    Those are retried after 10ms, 20ms, 40ms, ...; any other sqlite3.Error,
+    the last locked error, or a WriterBusyError (the pool has already waited
+    WRITER_WAIT for the writer) is raised to the caller.
+    """
+    for attempt in range(tries):
+        try:
+            return fn()
+        except WriterBusyError:
+            raise
+        except sqlite3.OperationalError as e:
+            message = str(e)
+            if attempt == tries - 1 or ("locked" not in message and "busy" not in message):
+                raise
+            time.sleep(0.01 * 2 ** attempt)
+
+
+@contextmanager
+def batched_writes(path: str = DB_PATH):
+    """
+    One transaction for many writer calls:
+
+        with batched_writes() as conn:
+            for row in rows:
+                create_incident(*row, conn=conn)
+
+    Writers given conn= skip their own commit, so the whole loop is synced
+    to disk once on exit instead of once per row. Rolls back if the block
+    raises.
+    """
+    with pooled_conn(path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def execute_write(sql: str, params=(), conn: sqlite3.Connection = None) -> int:
+    """
+    Run one INSERT/UPDATE/DELETE and return the number of rows it changed.
+
+    With conn (e.g. from batched_writes()) the statement joins that
+    transaction and the caller commits. Without it, a pooled connection
+    runs it in its own transaction, retried while the database is locked.
+    """
+    if conn is not None:
+        return conn.execute(sql, params).rowcount
+
+    def write():
+        # "with conn" commits on success and rolls back on error. The count
+        # is read here: once the connection is back in the pool another
+        # caller may already be using it.
+        with pooled_conn() as pooled, pooled:
+            return pooled.execute(sql, params).rowcount
+    return retry_locked(write)
+
+
 def get_connection(path: str = DB_PATH) -> sqlite3.Connection:
     """
     Alias for connect_database to support new code.
@@ -31,4 +366,4 @@ def close_connection(conn: sqlite3.Connection):
     Close the database connection.
     """
     if conn:
-        conn.close()
\ No newline at end of file
+        conn.close()
@@ -4,92 +4,87 @@ Handles CRUD operations for security incidents
 """
 
 import sqlite3
-from app.data.db import connect_database
+from app.data.db import execute_write, pooled_conn, retry_locked
+
+# SQL kept at module level so each call reuses the same statement text
+# (and hits sqlite3's per-connection prepared-statement cache)
+_SQL_GET_ALL_INCIDENTS = (
+    "SELECT incident_id, timestamp, severity, category, status, description "
+    "FROM cyber_incidents ORDER BY incident_id"
+)
+_SQL_GET_INCIDENT = (
+    "SELECT incident_id, timestamp, severity, category, status, description "
+    "FROM cyber_incidents WHERE incident_id = ?"
+)
+_SQL_INSERT_INCIDENT = (
+    "INSERT INTO cyber_incidents (timestamp, severity, category, status, description) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_SQL_UPDATE_INCIDENT = (
+    "UPDATE cyber_incidents "
+    "SET timestamp = ?, severity = ?, category = ?, status = ?, description = ? "
+    "WHERE incident_id = ?"
+)
+_SQL_DELETE_INCIDENT = "DELETE FROM cyber_incidents WHERE incident_id = ?"
+
+def iter_all_incidents(batch=1000):
+    """
+    Yield all incidents one row at a time, fetching `batch` rows per round trip.
+
+    Only one batch is held in memory. The connection goes back to the pool
+    once the generator is exhausted or closed.
+    """
+    with pooled_conn(readonly=True) as conn:
+        cur = conn.execute(_SQL_GET_ALL_INCIDENTS)
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                break
+            yield from rows
 
 def get_all_incidents():
     """Retrieve all incidents from database"""
-    conn = connect_database()
-    cur = conn.cursor()
-    
-    cur.execute(
-        "SELECT incident_id, timestamp, severity, category, status, description "
-        "FROM cyber_incidents ORDER BY incident_id"
-    )
-    
-    incidents = cur.fetchall()
-    conn.close()
-    
-    return incidents
+    return list(iter_all_incidents())
 
 def get_incident_by_id(incident_id):
-    """Retrieve a specific incident by ID"""
-    conn = connect_database()
-    cur = conn.cursor()
-    
-    cur.execute(
-        "SELECT incident_id, timestamp, severity, category, status, description "
-        "FROM cyber_incidents WHERE incident_id = ?",
-        (incident_id,)
-    )
-    
-    incident = cur.fetchone()
-    conn.close()
-    
-    return incident
+    """Retrieve a specific incident by ID (sqlite3.Row: access by index or column name)"""
+    with pooled_conn(readonly=True) as conn:
+        # Row factory on this cursor only; pooled connections stay on tuples
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur.execute(_SQL_GET_INCIDENT, (incident_id,)).fetchone()
 
-def create_incident(timestamp, severity, category, status, description):
+def create_incident(timestamp, severity, category, status, description, conn=None):
     """Create a new incident entry"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute(
-            "INSERT INTO cyber_incidents (timestamp, severity, category, status, description) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (timestamp, severity, category, status, description)
-        )
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
+    execute_write(_SQL_INSERT_INCIDENT, (timestamp, severity, category, status, description), conn)
 
-def update_incident(incident_id, timestamp, severity, category, status, description):
+def insert_incidents_many(rows, conn=None):
+    """
+    Insert many incidents in a single transaction.
+
+    rows: list of (timestamp, severity, category, status, description) tuples.
+    One commit for the whole batch instead of one per row, so bulk
+    imports are not limited by a sync per INSERT.
+
+    Returns the number of rows inserted. Pass conn to join a
+    batched_writes() transaction instead of committing here.
+    """
+    if conn is not None:
+        return conn.executemany(_SQL_INSERT_INCIDENT, rows).rowcount
+
+    def write():
+        with pooled_conn() as pooled, pooled:
+            return pooled.executemany(_SQL_INSERT_INCIDENT, rows).rowcount
+    return retry_locked(write)
+
+def update_incident(incident_id, timestamp, severity, category, status, description, conn=None):
     """Update an existing incident"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute(
-            "UPDATE cyber_incidents "
-            "SET timestamp = ?, severity = ?, category = ?, status = ?, description = ? "
-            "WHERE incident_id = ?",
-            (timestamp, severity, category, status, description, incident_id)
-        )
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
+    execute_write(
+        _SQL_UPDATE_INCIDENT,
+        (timestamp, severity, category, status, description, incident_id),
+        conn
+    )
 
-def delete_incident(incident_id):
+def delete_incident(incident_id, conn=None):
     """Delete an incident by ID"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute("DELETE FROM cyber_incidents WHERE incident_id = ?", (incident_id,))
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
\ No newline at end of file
+    execute_write(_SQL_DELETE_INCIDENT, (incident_id,), conn)
@@ -0,0 +1,96 @@
+"""
+Login lockout and session storage (Week 7 auth state)
+Replaces DATA/lockouts.txt and DATA/sessions.txt with SQLite tables,
+so each auth event is one indexed statement instead of a file rewrite
+"""
+
+import secrets
+from datetime import datetime, timedelta
+from app.data.db import execute_write, pooled_conn, retry_locked
+from app.data.schema import create_auth_tables
+
+# Failed attempts before an account is locked, and for how long
+MAX_FAILED_ATTEMPTS = 3
+LOCKOUT_MINUTES = 5
+
+# Only returns a row while the user is locked. locked_until is an ISO
+# timestamp, so "still locked" is a plain string comparison in SQLite.
+_SQL_GET_ACTIVE_LOCKOUT = (
+    "SELECT locked_until FROM lockouts "
+    "WHERE username = ? AND attempts >= ? AND locked_until > ?"
+)
+# One statement per failed attempt: insert the user or bump their count
+_SQL_RECORD_FAILURE = (
+    "INSERT INTO lockouts (username, attempts, locked_until) VALUES (?, 1, ?) "
+    "ON CONFLICT(username) DO UPDATE SET "
+    "attempts = attempts + 1, locked_until = excluded.locked_until"
+)
+_SQL_GET_ATTEMPTS = "SELECT attempts FROM lockouts WHERE username = ?"
+_SQL_DELETE_LOCKOUT = "DELETE FROM lockouts WHERE username = ?"
+_SQL_INSERT_SESSION = "INSERT INTO sessions (token, username, created_at) VALUES (?, ?, ?)"
+
+# Databases built before these tables existed get them on first use
+# instead of failing with "no such table"
+_tables_ready = False
+
+
+def _ensure_tables():
+    """Create the lockouts/sessions tables once per process, if missing."""
+    global _tables_ready
+    if _tables_ready:
+        return
+
+    def write():
+        with pooled_conn() as conn, conn:
+            create_auth_tables(conn.cursor())
+    retry_locked(write)
+    _tables_ready = True
+
+
+def is_account_locked(username):
+    """
+    Lockout check: locked after MAX_FAILED_ATTEMPTS failures, for LOCKOUT_MINUTES.
+
+    Returns (True, locked_until datetime) while locked, else (False, None).
+    """
+    _ensure_tables()
+    now = datetime.now().isoformat()
+    with pooled_conn(readonly=True) as conn:
+        row = conn.execute(
+            _SQL_GET_ACTIVE_LOCKOUT, (username, MAX_FAILED_ATTEMPTS, now)
+        ).fetchone()
+
+    if row is None:
+        return False, None
+    return True, datetime.fromisoformat(row[0])
+
+
+def record_failed_attempt(username):
+    """
+    Record a failed login and refresh the lockout timer.
+
+    Returns the user's failed attempt count so far.
+    """
+    _ensure_tables()
+    locked_until = (datetime.now() + timedelta(minutes=LOCKOUT_MINUTES)).isoformat()
+
+    def write():
+        with pooled_conn() as conn, conn:
+            conn.execute(_SQL_RECORD_FAILURE, (username, locked_until))
+            return conn.execute(_SQL_GET_ATTEMPTS, (username,)).fetchone()[0]
+    return retry_locked(write)
+
+
+def reset_failed_attempts(username):
+    """Clear a user's failed attempts after a successful login."""
+    _ensure_tables()
+    execute_write(_SQL_DELETE_LOCKOUT, (username,))
+
+
+def create_session(username):
+    """Create and store a new session token for username; returns the token."""
+    _ensure_tables()
+    # 128 random bits as 22 URL-safe chars (token_hex needs 32)
+    token = secrets.token_urlsafe(16)
+    execute_write(_SQL_INSERT_SESSION, (token, username, datetime.now().isoformat()))
+    return token
@@ -10,19 +10,109 @@ Week 8: Initial schema design with proper normalization
 Week 11: Updated to match entity class requirements
 """
 
+import sqlite3
 from app.data.db import connect_database
 
 
+def _create_indexes(cur: sqlite3.Cursor) -> None:
+    """Create the app's indexes (caller runs this inside a transaction)."""
+    # --------------------------------------------------
+    # Indexes for the columns the dashboards filter,
+    # group and sort on (avoids full table scans)
+    # --------------------------------------------------
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_incidents_ts ON cyber_incidents(timestamp)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_datasets_rows ON datasets_metadata(rows)")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tickets_created "
+        "ON it_tickets(created_at DESC, ticket_id DESC)"
+    )
+
+    # Covering index for the incident counts: every column they read is in
+    # the index, so SQLite never loads table rows (and their description
+    # text). Lookups on category, or category and status, use its prefix.
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_incidents_cov "
+        "ON cyber_incidents(category, status, severity, timestamp)"
+    )
+
+    # Partial index over unresolved incidents only (the app's rule is
+    # status != 'Resolved'). Much smaller than a full index, so counts like
+    # the home page's "Active Incidents" can scan it instead of the table.
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_incidents_unresolved "
+        "ON cyber_incidents(category, timestamp) WHERE status != 'Resolved'"
+    )
+
+
+def create_auth_tables(cur: sqlite3.Cursor) -> None:
+    """
+    Create the lockouts/sessions tables used by app/data/lockouts.py.
+
+    Kept separate so fix_database.py and lockouts.py (which creates them on
+    first use in databases built before they existed) share this DDL.
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS lockouts (
+            username TEXT PRIMARY KEY,
+            attempts INTEGER NOT NULL,
+            locked_until TEXT NOT NULL
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            token TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+
+
+def _update_statistics(cur: sqlite3.Cursor) -> None:
+    """Refresh the query planner's statistics."""
+    # Planner statistics: full ANALYZE the first time (no sqlite_stat1 yet),
+    # afterwards PRAGMA optimize only re-analyzes tables that need it
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+    if cur.fetchone() is None:
+        cur.execute("ANALYZE")
+    else:
+        cur.execute("PRAGMA optimize")
+
+
+def create_indexes() -> None:
+    """
+    Create the indexes and run a full ANALYZE.
+
+    create_tables() already does this. Call it on its own after tables were
+    rebuilt and bulk-loaded elsewhere (fix_database.py drops them, which
+    drops their indexes too). Building indexes after the load is also
+    cheaper than updating them row by row during it.
+    """
+    conn = connect_database()
+    cur = conn.cursor()
+
+    cur.execute("BEGIN IMMEDIATE")
+    _create_indexes(cur)
+    conn.commit()
+
+    cur.execute("ANALYZE")
+    conn.close()
+
+
 def create_tables() -> None:
     """
     Create all tables needed for the intelligence platform.
     
     Uses CREATE TABLE IF NOT EXISTS so it's safe to run multiple times.
     This is helpful during development when testing schema changes.
+
+    All tables and indexes are created in one transaction, so a half-built
+    schema is never left behind and there is only one commit.
     """
     conn = connect_database()
     cur = conn.cursor()
 
+    cur.execute("BEGIN IMMEDIATE")
+
     # --------------------------------------------------
     # Users table (Week 7 auth migrated to database)
     # --------------------------------------------------
@@ -35,6 +125,12 @@ def create_tables() -> None:
         )
     """)
 
+    # --------------------------------------------------
+    # Login lockouts + session tokens (Week 7 text files
+    # migrated to database)
+    # --------------------------------------------------
+    create_auth_tables(cur)
+
     # --------------------------------------------------
     # Cybersecurity domain table
     # --------------------------------------------------
@@ -81,9 +177,13 @@ def create_tables() -> None:
         )
     """)
 
+    _create_indexes(cur)
+
     conn.commit()
+
+    _update_statistics(cur)
     conn.close()
-    
+
 
 def reset_database():
     """
@@ -93,11 +193,14 @@ def reset_database():
     conn = connect_database()
     cur = conn.cursor()
     
-    # Drop existing tables
+    # Drop existing tables (one transaction)
+    cur.execute("BEGIN IMMEDIATE")
     cur.execute("DROP TABLE IF EXISTS users")
     cur.execute("DROP TABLE IF EXISTS cyber_incidents")
     cur.execute("DROP TABLE IF EXISTS datasets_metadata")
     cur.execute("DROP TABLE IF EXISTS it_tickets")
+    cur.execute("DROP TABLE IF EXISTS lockouts")
+    cur.execute("DROP TABLE IF EXISTS sessions")
     
     conn.commit()
     conn.close()
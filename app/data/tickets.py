@@ -4,92 +4,125 @@ Handles CRUD operations for IT support tickets
 """
 
 import sqlite3
-from app.data.db import connect_database
+from app.data.db import batched_writes, execute_write, pooled_conn, retry_locked
+
+# SQL kept at module level so each call reuses the same statement text
+# (and hits sqlite3's per-connection prepared-statement cache)
+_SQL_GET_ALL_TICKETS = (
+    "SELECT ticket_id, created_at, priority, status, assigned_to, title, description "
+    "FROM it_tickets ORDER BY ticket_id"
+)
+_SQL_GET_TICKET = (
+    "SELECT ticket_id, created_at, priority, status, assigned_to, title, description "
+    "FROM it_tickets WHERE ticket_id = ?"
+)
+# Newest first, one page at a time (keyset pagination on idx_tickets_created)
+_SQL_TICKETS_FIRST_PAGE = (
+    "SELECT ticket_id, created_at, priority, status, assigned_to, title, description "
+    "FROM it_tickets ORDER BY created_at DESC, ticket_id DESC LIMIT ?"
+)
+_SQL_TICKETS_NEXT_PAGE = (
+    "SELECT ticket_id, created_at, priority, status, assigned_to, title, description "
+    "FROM it_tickets WHERE (created_at, ticket_id) < (?, ?) "
+    "ORDER BY created_at DESC, ticket_id DESC LIMIT ?"
+)
+_SQL_INSERT_TICKET = (
+    "INSERT INTO it_tickets (created_at, priority, status, assigned_to, title, description) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_UPDATE_TICKET = (
+    "UPDATE it_tickets "
+    "SET created_at = ?, priority = ?, status = ?, assigned_to = ?, title = ?, description = ? "
+    "WHERE ticket_id = ?"
+)
+_SQL_DELETE_TICKET = "DELETE FROM it_tickets WHERE ticket_id = ?"
+# RETURNING hands back each new ticket_id (SQLite 3.35+)
+_SQL_INSERT_TICKET_RETURNING = _SQL_INSERT_TICKET + " RETURNING ticket_id"
+
+def iter_all_tickets(batch=1000):
+    """
+    Yield all tickets one row at a time, fetching `batch` rows per round trip.
+
+    Only one batch is held in memory. The connection goes back to the pool
+    once the generator is exhausted or closed.
+    """
+    with pooled_conn(readonly=True) as conn:
+        cur = conn.execute(_SQL_GET_ALL_TICKETS)
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                break
+            yield from rows
 
 def get_all_tickets():
     """Retrieve all tickets from database"""
-    conn = connect_database()
-    cur = conn.cursor()
-    
-    cur.execute(
-        "SELECT ticket_id, created_at, priority, status, assigned_to, title, description "
-        "FROM it_tickets ORDER BY ticket_id"
-    )
-    
-    tickets = cur.fetchall()
-    conn.close()
-    
-    return tickets
+    return list(iter_all_tickets())
+
+def get_tickets_page(limit=50, before_created_at=None, before_id=None):
+    """
+    Retrieve one page of tickets, newest first.
+
+    For the next page pass the created_at and ticket_id of the last ticket
+    on the current one. The index is read from that point on, so the query
+    never sorts the table or skips over earlier pages (unlike OFFSET).
+    """
+    with pooled_conn(readonly=True) as conn:
+        if before_created_at is None or before_id is None:
+            return conn.execute(_SQL_TICKETS_FIRST_PAGE, (limit,)).fetchall()
+        return conn.execute(_SQL_TICKETS_NEXT_PAGE, (before_created_at, before_id, limit)).fetchall()
 
 def get_ticket_by_id(ticket_id):
-    """Retrieve a specific ticket by ID"""
-    conn = connect_database()
-    cur = conn.cursor()
-    
-    cur.execute(
-        "SELECT ticket_id, created_at, priority, status, assigned_to, title, description "
-        "FROM it_tickets WHERE ticket_id = ?",
-        (ticket_id,)
-    )
-    
-    ticket = cur.fetchone()
-    conn.close()
-    
-    return ticket
+    """Retrieve a specific ticket by ID (sqlite3.Row: access by index or column name)"""
+    with pooled_conn(readonly=True) as conn:
+        # Row factory on this cursor only; pooled connections stay on tuples
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur.execute(_SQL_GET_TICKET, (ticket_id,)).fetchone()
 
-def create_ticket(created_at, priority, status, assigned_to, title, description):
+def create_ticket(created_at, priority, status, assigned_to, title, description, conn=None):
     """Create a new ticket entry"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute(
-            "INSERT INTO it_tickets (created_at, priority, status, assigned_to, title, description) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (created_at, priority, status, assigned_to, title, description)
-        )
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
-
-def update_ticket(ticket_id, created_at, priority, status, assigned_to, title, description):
+    execute_write(
+        _SQL_INSERT_TICKET,
+        (created_at, priority, status, assigned_to, title, description),
+        conn
+    )
+
+def _insert_tickets(conn, rows):
+    """Insert the rows on conn (inside an open write transaction) and return their ids."""
+    if not rows:
+        return []
+    # One prepared statement reused per row (executemany cannot return rows);
+    # each ticket_id comes from RETURNING, so no assumption about id order
+    return [conn.execute(_SQL_INSERT_TICKET_RETURNING, row).fetchone()[0] for row in rows]
+
+def insert_tickets_many(rows, conn=None):
+    """
+    Insert many tickets in a single transaction.
+
+    rows: list of (created_at, priority, status, assigned_to, title, description) tuples.
+    The write lock is taken once (BEGIN IMMEDIATE) and there is one commit
+    for the whole batch.
+
+    Returns the new ticket_ids in the same order as rows. Pass conn to join
+    a batched_writes() transaction instead of committing here.
+    """
+    rows = list(rows)
+    if conn is not None:
+        return _insert_tickets(conn, rows)
+
+    def write():
+        with batched_writes() as pooled:
+            return _insert_tickets(pooled, rows)
+    return retry_locked(write)
+
+def update_ticket(ticket_id, created_at, priority, status, assigned_to, title, description, conn=None):
     """Update an existing ticket"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute(
-            "UPDATE it_tickets "
-            "SET created_at = ?, priority = ?, status = ?, assigned_to = ?, title = ?, description = ? "
-            "WHERE ticket_id = ?",
-            (created_at, priority, status, assigned_to, title, description, ticket_id)
-        )
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
-
-def delete_ticket(ticket_id):
+    execute_write(
+        _SQL_UPDATE_TICKET,
+        (created_at, priority, status, assigned_to, title, description, ticket_id),
+        conn
+    )
+
+def delete_ticket(ticket_id, conn=None):
     """Delete a ticket by ID"""
-    try:
-        conn = connect_database()
-        cur = conn.cursor()
-        
-        cur.execute("DELETE FROM it_tickets WHERE ticket_id = ?", (ticket_id,))
-        
-        conn.commit()
-        conn.close()
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-        return False
\ No newline at end of file
+    execute_write(_SQL_DELETE_TICKET, (ticket_id,), conn)
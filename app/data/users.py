@@ -1,5 +1,15 @@
-from typing import List, Optional, Tuple
-from app.data.db import connect_database
+from typing import Iterator, List, Optional, Tuple
+from app.data.db import execute_write, pooled_conn, retry_locked
+
+_SQL_INSERT_USER = "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)"
+_SQL_INSERT_USER_IGNORE = "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)"
+_SQL_GET_USER = "SELECT id, username, role FROM users WHERE username = ?"
+_SQL_GET_ALL_USERS = "SELECT id, username, role FROM users ORDER BY id"
+_SQL_UPDATE_ROLE = "UPDATE users SET role = ? WHERE username = ?"
+_SQL_UPDATE_PASSWORD = "UPDATE users SET password_hash = ? WHERE username = ?"
+_SQL_DELETE_USER = "DELETE FROM users WHERE username = ?"
+_SQL_GET_CREDENTIALS = "SELECT password_hash, role FROM users WHERE username = ?"
+_SQL_GET_ROLE = "SELECT role FROM users WHERE username = ?"
 
 
 def create_user(username: str, password_hash: str, role: str = "user") -> None:
@@ -7,14 +17,26 @@ def create_user(username: str, password_hash: str, role: str = "user") -> None:
     Insert a new user into the users table.
     The password_hash is already generated by the Week 7 auth system.
     """
-    conn = connect_database()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-        (username, password_hash, role),
-    )
-    conn.commit()
-    conn.close()
+    execute_write(_SQL_INSERT_USER, (username, password_hash, role))
+
+
+def create_users_many(rows) -> int:
+    """
+    Insert many users in a single transaction.
+
+    rows: iterable of (username, password_hash, role) tuples.
+    Usernames that already exist are skipped (INSERT OR IGNORE), so seeding
+    or migrating users can be re-run safely. One executemany and one commit
+    for the whole batch instead of one per user.
+
+    Returns the number of users actually inserted.
+    """
+    rows = list(rows)
+
+    def write():
+        with pooled_conn() as conn, conn:
+            return conn.executemany(_SQL_INSERT_USER_IGNORE, rows).rowcount
+    return retry_locked(write)
 
 
 def get_user_by_username(username: str) -> Optional[Tuple[int, str, str]]:
@@ -23,27 +45,32 @@ def get_user_by_username(username: str) -> Optional[Tuple[int, str, str]]:
 
     Returns a tuple (id, username, role) or None if not found.
     """
-    conn = connect_database()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, username, role FROM users WHERE username = ?",
-        (username,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
+    with pooled_conn(readonly=True) as conn:
+        return conn.execute(_SQL_GET_USER, (username,)).fetchone()
+
+
+def iter_all_users(batch: int = 1000) -> Iterator[Tuple[int, str, str]]:
+    """
+    Yield all users as (id, username, role) tuples, fetching `batch` rows
+    per round trip.
+
+    Only one batch is held in memory. The connection goes back to the pool
+    once the generator is exhausted or closed.
+    """
+    with pooled_conn(readonly=True) as conn:
+        cur = conn.execute(_SQL_GET_ALL_USERS)
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                break
+            yield from rows
 
 
 def get_all_users() -> List[Tuple[int, str, str]]:
     """
     Return all users as a list of (id, username, role) tuples.
     """
-    conn = connect_database()
-    cur = conn.cursor()
-    cur.execute("SELECT id, username, role FROM users ORDER BY id")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    return list(iter_all_users())
 
 
 def update_user_role(username: str, new_role: str) -> int:
@@ -52,16 +79,16 @@ def update_user_role(username: str, new_role: str) -> int:
 
     Returns the number of rows that were updated (0 or 1).
     """
-    conn = connect_database()
-    cur = conn.cursor()
-    cur.execute(
-        "UPDATE users SET role = ? WHERE username = ?",
-        (new_role, username),
-    )
-    conn.commit()
-    count = cur.rowcount
-    conn.close()
-    return count
+    return execute_write(_SQL_UPDATE_ROLE, (new_role, username))
+
+
+def update_password_hash(username: str, password_hash: str) -> int:
+    """
+    Replace the stored password hash for a given username.
+
+    Returns the number of rows that were updated (0 or 1).
+    """
+    return execute_write(_SQL_UPDATE_PASSWORD, (password_hash, username))
 
 
 def delete_user(username: str) -> int:
@@ -70,57 +97,44 @@ def delete_user(username: str) -> int:
 
     Returns the number of rows that were deleted (0 or 1).
     """
-    conn = connect_database()
-    cur = conn.cursor()
-    cur.execute(
-        "DELETE FROM users WHERE username = ?",
-        (username,),
-    )
-    conn.commit()
-    count = cur.rowcount
-    conn.close()
-    return count
+    return execute_write(_SQL_DELETE_USER, (username,))
 # --- Extra helpers for Week 9 (used by Streamlit) ---
 
-from auth import verify_password  # we reuse Week 7 password check
+# Shared password helpers; bcrypt itself is only imported when a password is hashed or checked
+from app.services.user_service import check_password, hash_password, needs_rehash
 
 
 def verify_user(username: str, plain_password: str):
     """
     Check username + password against the users table.
 
+    A valid password stored with a weaker hash than BCRYPT_ROUNDS is
+    re-hashed once, while the plain password is known.
+
     Returns:
         (True, role)  if credentials are valid
         (False, None) otherwise
     """
-    conn = connect_database()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT password_hash, role FROM users WHERE username = ?",
-        (username,),
-    )
-    row = cur.fetchone()
-    conn.close()
+    with pooled_conn(readonly=True) as conn:
+        row = conn.execute(_SQL_GET_CREDENTIALS, (username,)).fetchone()
 
     if row is None:
         return False, None
 
     stored_hash, role = row
-    if verify_password(plain_password, stored_hash):
-        return True, role
-    return False, None
+    if not check_password(plain_password, stored_hash):
+        return False, None
+
+    if needs_rehash(stored_hash):
+        update_password_hash(username, hash_password(plain_password))
+    return True, role
 
 
 def get_user_role(username: str):
     """
     Get the role for a given username, or None if user does not exist.
     """
-    conn = connect_database()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT role FROM users WHERE username = ?",
-        (username,),
-    )
-    row = cur.fetchone()
-    conn.close()
+    with pooled_conn(readonly=True) as conn:
+        row = conn.execute(_SQL_GET_ROLE, (username,)).fetchone()
     return row[0] if row else None
+
@@ -5,9 +5,9 @@ Week 11: OOP implementation
 
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Dataset:
-    """Represents a dataset in the Data Science domain"""
+    """Represents a dataset in the Data Science domain (slots: no per-object __dict__; frozen)"""
     dataset_id: int
     name: str
     source: str
@@ -16,6 +16,18 @@ class Dataset:
     quality_score: float
     status: str
     
+    def __post_init__(self):
+        """Coerce numeric fields once, so the methods below never need to"""
+        # frozen: fields are set through object.__setattr__
+        object.__setattr__(self, "size_mb", float(self.size_mb))
+        object.__setattr__(self, "rows", int(self.rows))
+        object.__setattr__(self, "quality_score", float(self.quality_score))
+    
+    @classmethod
+    def from_row(cls, row) -> "Dataset":
+        """Build from a datasets_metadata row in column order (tuple or sqlite3.Row)"""
+        return cls(*row)
+    
     def is_large(self) -> bool:
         """Check if dataset exceeds archiving threshold"""
         return self.size_mb > 500 or self.rows > 1000000
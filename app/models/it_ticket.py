@@ -12,16 +12,31 @@ Week 11 learning: Instead of working with raw database rows,
 we create objects that have both data and useful methods.
 """
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Optional
 
+# Business rules as lookup tables (keys are lower-cased priority/status).
+# Anything not listed is treated like "low" / contributes nothing.
+PRIORITY_URGENCY = {"critical": 50, "high": 30, "medium": 15, "low": 5}
+STATUS_URGENCY = {"open": 20, "in progress": 10}
+PRIORITY_SLA_HOURS = {
+    "critical": 4,   # 4 hours
+    "high": 24,      # 1 day
+    "medium": 72,    # 3 days
+    "low": 168,      # 1 week
+}
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ITTicket:
     """
     Represents an IT support ticket.
     
     Attributes match the columns from it_tickets table.
+    slots=True: no per-object __dict__, so large ticket lists use less memory.
+    frozen=True: fields cannot be reassigned, so the keys derived from them
+    in __post_init__ can never go stale.
     """
     ticket_id: int
     created_at: str
@@ -31,6 +46,33 @@ class ITTicket:
     title: str
     description: str
 
+    # created_at as Unix seconds, parsed once in __post_init__ (None if it is
+    # not a valid date)
+    _created_ts: Optional[float] = field(init=False, repr=False, compare=False, default=None)
+    # priority/status lower-cased once for the business rules below
+    _priority_key: str = field(init=False, repr=False, compare=False, default="")
+    _status_key: str = field(init=False, repr=False, compare=False, default="")
+
+    def __post_init__(self):
+        # frozen: derived fields are set through object.__setattr__
+        object.__setattr__(self, "_priority_key", str(self.priority).strip().lower())
+        object.__setattr__(self, "_status_key", str(self.status).strip().lower())
+        try:
+            created_ts = datetime.fromisoformat(self.created_at).timestamp()
+        except (TypeError, ValueError):
+            created_ts = None
+        object.__setattr__(self, "_created_ts", created_ts)
+
+    @classmethod
+    def from_row(cls, row) -> "ITTicket":
+        """
+        Build a ticket straight from an it_tickets row (tuple or sqlite3.Row).
+
+        The row must be in column order:
+        ticket_id, created_at, priority, status, assigned_to, title, description
+        """
+        return cls(*row)
+
     def is_overdue(self, sla_hours: int = 24) -> bool:
         """
         Check if ticket has exceeded SLA based on priority.
@@ -44,18 +86,16 @@ class ITTicket:
         Returns:
             True if ticket is overdue
         """
-        if self.status.lower() == "resolved":
+        if self._status_key == "resolved":
             return False
         
-        try:
-            created = datetime.fromisoformat(self.created_at)
-            now = datetime.now()
-            age_hours = (now - created).total_seconds() / 3600
-            return age_hours > sla_hours
-        except:
-            # If date parsing fails, assume not overdue
+        if self._created_ts is None:
+            # If date parsing failed, assume not overdue
             return False
 
+        # Plain float arithmetic: no datetime objects per call
+        return time.time() - self._created_ts > sla_hours * 3600
+
     def urgency_score(self) -> int:
         """
         Calculate urgency score for prioritization.
@@ -63,25 +103,11 @@ class ITTicket:
         Higher score = more urgent
         This is business logic that belongs in the entity, not the UI.
         """
-        score = 0
-        
-        # Priority contribution
-        priority_lower = self.priority.lower()
-        if priority_lower == "critical":
-            score += 50
-        elif priority_lower == "high":
-            score += 30
-        elif priority_lower == "medium":
-            score += 15
-        else:  # low
-            score += 5
-        
-        # Status contribution
-        status_lower = self.status.lower()
-        if status_lower == "open":
-            score += 20
-        elif status_lower == "in progress":
-            score += 10
+        # Priority + status contribution
+        score = (
+            PRIORITY_URGENCY.get(self._priority_key, PRIORITY_URGENCY["low"])
+            + STATUS_URGENCY.get(self._status_key, 0)
+        )
         
         # Overdue adds urgency
         if self.is_overdue():
@@ -131,13 +157,4 @@ class ITTicket:
         
         Returns expected resolution time in hours.
         """
-        priority_lower = self.priority.lower()
-        
-        if priority_lower == "critical":
-            return 4  # 4 hours
-        elif priority_lower == "high":
-            return 24  # 1 day
-        elif priority_lower == "medium":
-            return 72  # 3 days
-        else:  # low
-            return 168  # 1 week
\ No newline at end of file
+        return PRIORITY_SLA_HOURS.get(self._priority_key, PRIORITY_SLA_HOURS["low"])
@@ -11,11 +11,16 @@ We include:
   - to_prompt_context()  -> used by Week 10 AI to inject context
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+# Severity (lower-cased) -> basic risk level; anything else is "Low"
+SEVERITY_RISK = {"critical": "Very High", "high": "High", "medium": "Medium"}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class SecurityIncident:
+    """One cyber_incidents row (slots: no per-object __dict__; frozen, so the cached keys stay valid)"""
+
     incident_id: int
     timestamp: str
     severity: str
@@ -23,23 +28,33 @@ class SecurityIncident:
     status: str
     description: str
 
+    # status/severity lower-cased once, instead of on every method call
+    _status_key: str = field(init=False, repr=False, compare=False, default="")
+    _severity_key: str = field(init=False, repr=False, compare=False, default="")
+
+    def __post_init__(self):
+        # frozen: derived fields are set through object.__setattr__
+        object.__setattr__(self, "_status_key", str(self.status).strip().lower())
+        object.__setattr__(self, "_severity_key", str(self.severity).strip().lower())
+
+    @classmethod
+    def from_row(cls, row) -> "SecurityIncident":
+        """
+        Build an incident straight from a cyber_incidents row (tuple or sqlite3.Row),
+        in column order: incident_id, timestamp, severity, category, status, description
+        """
+        return cls(*row)
+
     def is_unresolved(self) -> bool:
         """Return True if the incident is not resolved."""
-        return str(self.status).strip().lower() != "resolved"
+        return self._status_key != "resolved"
 
     def risk_level(self) -> str:
         """
         Very simple risk assessment method.
         This is an example of 'behaviour inside the object' (OOP).
         """
-        sev = str(self.severity).strip().lower()
-        if sev == "critical":
-            return "Very High"
-        if sev == "high":
-            return "High"
-        if sev == "medium":
-            return "Medium"
-        return "Low"
+        return SEVERITY_RISK.get(self._severity_key, "Low")
 
     def short_label(self) -> str:
         """Small label used in dropdowns."""
@@ -12,10 +12,10 @@ Note:
 - Entity classes should stay "business-oriented" and easy to test.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class User:
     """
     Represents one user account in the platform.
@@ -24,18 +24,27 @@ class User:
         username (str): the unique user name
         role (str): user role: "user", "analyst", "admin"
         password_hash (str): stored hashed password (bcrypt)
+
+    frozen=True: role cannot be reassigned, so _role_key can never go stale.
     """
     username: str
     role: str
     password_hash: str = ""
 
+    # role lower-cased once, instead of on every is_admin/is_analyst call
+    _role_key: str = field(init=False, repr=False, compare=False, default="")
+
+    def __post_init__(self):
+        # frozen: derived fields are set through object.__setattr__
+        object.__setattr__(self, "_role_key", self.role.lower())
+
     def is_admin(self) -> bool:
         """Return True if this user is an admin."""
-        return self.role.lower() == "admin"
+        return self._role_key == "admin"
 
     def is_analyst(self) -> bool:
         """Return True if this user is an analyst."""
-        return self.role.lower() == "analyst"
+        return self._role_key == "analyst"
 
     def display_label(self) -> str:
         """Nice label used in UI."""
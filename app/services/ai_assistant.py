@@ -13,9 +13,17 @@ IMPORTANT:
 
 from __future__ import annotations
 
-from typing import Generator, List, Dict
+from functools import lru_cache
+from typing import Generator, List, Dict, Tuple
 import streamlit as st
 
+# Import OpenAI once; if the package is missing we show a setup message
+# later instead of crashing app startup
+try:
+    from openai import OpenAI
+except Exception:
+    OpenAI = None
+
 
 def safe_error_message(err: Exception) -> str:
     """
@@ -41,6 +49,7 @@ def safe_error_message(err: Exception) -> str:
     return f"AI error: {msg}"
 
 
+@lru_cache(maxsize=8)
 def _domain_system_prompt(domain: str) -> str:
     """
     Domain-specific system prompt (Week 10 multi-domain requirement).
@@ -70,30 +79,33 @@ def _domain_system_prompt(domain: str) -> str:
     )
 
 
-def stream_chat_completion(
-    domain: str,
-    chat_history: List[Dict[str, str]],
-    extra_context: str = "",
-    model: str = "gpt-4o-mini",
-) -> Generator[str, None, None]:
-    """
-    Stream a chat completion.
+# Shown instead of an answer when the AI is not set up (app should not crash)
+_MISSING_KEY_MESSAGE = (
+    "⚠️ AI is not configured yet (missing OPENAI_API_KEY).\n\n"
+    "To enable Week 10 AI:\n"
+    "1) Install package: `pip install openai`\n"
+    "2) Create `.streamlit/secrets.toml` with:\n"
+    '   OPENAI_API_KEY = "sk-..."\n'
+)
+_MISSING_PACKAGE_MESSAGE = (
+    "⚠️ The `openai` package is not installed.\n\n"
+    "Fix:\n"
+    "- Run: `pip install openai`\n"
+    "- And keep OPENAI_API_KEY in `.streamlit/secrets.toml`\n"
+)
 
-    chat_history format:
-    [
-      {"role": "user", "content": "..."},
-      {"role": "assistant", "content": "..."},
-      ...
-    ]
+# Number of non-streamed answers kept by complete_chat()
+COMPLETION_CACHE_SIZE = 256
 
-    extra_context:
-    - optional DB context (incident/dataset/ticket) injected into the prompt.
 
-    IMPORTANT:
-    - We do NOT crash if openai is not installed or key missing.
-    - We yield text progressively (streaming).
-    """
+class _NotConfigured(Exception):
+    """Raised inside the cached path so setup messages are never cached."""
 
+
+def _client_or_setup_message():
+    """
+    Return (client, None) when AI is usable, else (None, message for the user).
+    """
     # 1) Read API key from secrets (recommended for Streamlit)
     api_key = None
     try:
@@ -103,32 +115,36 @@ def stream_chat_completion(
 
     # 2) If no key -> return a helpful “setup” message (still satisfies UI demo)
     if not api_key:
-        yield (
-            "⚠️ AI is not configured yet (missing OPENAI_API_KEY).\n\n"
-            "To enable Week 10 AI:\n"
-            "1) Install package: `pip install openai`\n"
-            "2) Create `.streamlit/secrets.toml` with:\n"
-            '   OPENAI_API_KEY = "sk-..."\n'
-        )
-        return
+        return None, _MISSING_KEY_MESSAGE
 
-    # 3) Import OpenAI only when we need it (so missing package doesn't crash app startup)
-    try:
-        from openai import OpenAI
-    except Exception:
-        yield (
-            "⚠️ The `openai` package is not installed.\n\n"
-            "Fix:\n"
-            "- Run: `pip install openai`\n"
-            "- And keep OPENAI_API_KEY in `.streamlit/secrets.toml`\n"
-        )
-        return
+    # 3) openai package missing -> setup message instead of a crash
+    if OpenAI is None:
+        return None, _MISSING_PACKAGE_MESSAGE
+
+    return _get_client(api_key), None
+
+
+@lru_cache(maxsize=1)
+def _get_client(api_key: str):
+    """
+    One OpenAI client per API key, reused across chat turns.
 
-    client = OpenAI(api_key=api_key)
+    The client keeps its HTTP connection pool, so later requests skip the
+    TCP/TLS setup. A changed key simply builds a new client.
+    """
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=32)
+def _system_messages(domain: str, extra_context: str) -> Tuple[Dict[str, str], ...]:
+    """
+    System prompt + optional DB context block.
 
+    These stay the same for every turn of a conversation, so they are built
+    once per (domain, context) and reused. Callers must not modify them.
+    """
     system_prompt = _domain_system_prompt(domain)
 
-    # Build messages
     messages = [{"role": "system", "content": system_prompt}]
 
     if extra_context and extra_context.strip():
@@ -142,6 +158,13 @@ def stream_chat_completion(
             }
         )
 
+    return tuple(messages)
+
+
+def _build_messages(domain: str, chat_history, extra_context: str) -> List[Dict[str, str]]:
+    """System prompt + optional DB context + user/assistant history."""
+    messages = list(_system_messages(domain, extra_context))
+
     # Add conversation history
     for m in chat_history:
         # We only accept roles: user/assistant
@@ -150,6 +173,39 @@ def stream_chat_completion(
         if role in ("user", "assistant") and content:
             messages.append({"role": role, "content": content})
 
+    return messages
+
+
+def stream_chat_completion(
+    domain: str,
+    chat_history: List[Dict[str, str]],
+    extra_context: str = "",
+    model: str = "gpt-4o-mini",
+) -> Generator[str, None, None]:
+    """
+    Stream a chat completion.
+
+    chat_history format:
+    [
+      {"role": "user", "content": "..."},
+      {"role": "assistant", "content": "..."},
+      ...
+    ]
+
+    extra_context:
+    - optional DB context (incident/dataset/ticket) injected into the prompt.
+
+    IMPORTANT:
+    - We do NOT crash if openai is not installed or key missing.
+    - We yield text progressively (streaming).
+    """
+    client, setup_message = _client_or_setup_message()
+    if client is None:
+        yield setup_message
+        return
+
+    messages = _build_messages(domain, chat_history, extra_context)
+
     # 4) Stream from OpenAI
     stream = client.chat.completions.create(
         model=model,
@@ -162,3 +218,50 @@ def stream_chat_completion(
         delta = event.choices[0].delta
         if delta and getattr(delta, "content", None):
             yield delta.content
+
+
+def complete_chat(
+    domain: str,
+    chat_history: List[Dict[str, str]],
+    extra_context: str = "",
+    model: str = "gpt-4o-mini",
+) -> str:
+    """
+    Same as stream_chat_completion, but returns the whole answer as one string.
+
+    For callers that do not display tokens as they arrive. One request with
+    stream=False, and repeated identical prompts (same domain, history,
+    context and model) are answered from an in-memory cache.
+    """
+    # Hashable copy of the history for the cache key
+    history = tuple((m.get("role", ""), m.get("content", "")) for m in chat_history)
+    try:
+        return _cached_completion(domain, history, extra_context, model)
+    except _NotConfigured as e:
+        return str(e)
+
+
+@lru_cache(maxsize=COMPLETION_CACHE_SIZE)
+def _cached_completion(
+    domain: str,
+    history: Tuple[Tuple[str, str], ...],
+    extra_context: str,
+    model: str,
+) -> str:
+    """One non-streamed completion; history is (role, content) pairs so it can be a cache key."""
+    client, setup_message = _client_or_setup_message()
+    if client is None:
+        raise _NotConfigured(setup_message)
+
+    messages = _build_messages(
+        domain,
+        [{"role": role, "content": content} for role, content in history],
+        extra_context,
+    )
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        stream=False,
+        temperature=0.3,  # low-ish to reduce hallucinations
+    )
+    return response.choices[0].message.content or ""
@@ -1,17 +1,94 @@
+import csv
 import os
 import sqlite3
-import pandas as pd
-from app.data.db import DB_PATH
+from itertools import islice
+from app.data.db import connect_database
+
+# Rows handed to executemany() at a time while streaming a CSV
+LOAD_BATCH_SIZE = 10_000
+
+# CSV file in DATA/ -> target table (file name is <table>.csv)
+CSV_TABLES = ("cyber_incidents", "datasets_metadata", "it_tickets")
 
 
 def _table_is_empty(conn: sqlite3.Connection, table_name: str) -> bool:
     """
     Helper function to check if a table already contains rows.
+
+    Reads at most one row (COUNT(*) would scan the whole table).
+    table_name is formatted into the SQL, so only CSV_TABLES are accepted.
+    """
+    if table_name not in CSV_TABLES:
+        raise ValueError(f"Unknown table: {table_name}")
+    return conn.execute(f"SELECT 1 FROM {table_name} LIMIT 1").fetchone() is None
+
+
+def _csv_batches(csv_path: str, columns: list):
+    """
+    Yield lists of row tuples (LOAD_BATCH_SIZE at a time) for the given
+    CSV columns, in that order. Values stay strings; empty cells are None.
+
+    pyarrow (in requirements.txt) is imported here rather than at module
+    level so importing the loader stays cheap; its multi-threaded CSV reader
+    is used when available, otherwise the csv module.
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pacsv
+    except ImportError:
+        pacsv = None
+
+    if pacsv is not None:
+        convert = pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types={name: pa.string() for name in columns},
+            null_values=[""],
+            strings_can_be_null=True,
+        )
+        table = pacsv.read_csv(csv_path, convert_options=convert)
+        for batch in table.to_batches(max_chunksize=LOAD_BATCH_SIZE):
+            yield list(zip(*(column.to_pylist() for column in batch.columns)))
+        return
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        keep = [header.index(name) for name in columns]
+        rows = ([row[i] or None for i in keep] for row in reader)
+        while True:
+            batch = list(islice(rows, LOAD_BATCH_SIZE))
+            if not batch:
+                break
+            yield batch
+
+
+def _load_csv(conn: sqlite3.Connection, csv_path: str, table_name: str) -> int:
     """
-    cur = conn.cursor()
-    cur.execute(f"SELECT COUNT(*) FROM {table_name}")
-    (count,) = cur.fetchone()
-    return count == 0
+    Stream one CSV file into a table inside a single transaction.
+
+    Rows are parsed by pyarrow (or the csv module) and inserted
+    LOAD_BATCH_SIZE at a time with executemany, so there is one commit.
+    CSV columns the table does not have are skipped; empty cells become NULL.
+
+    Returns the number of rows inserted.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), None)
+    if header is None:
+        return 0
+
+    table_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+    columns = [name for name in header if name in table_columns]
+    placeholders = ", ".join("?" * len(columns))
+    sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    total = 0
+    # "with conn" commits once at the end and rolls back on error
+    with conn:
+        for batch in _csv_batches(csv_path, columns):
+            conn.executemany(sql, batch)
+            total += len(batch)
+    return total
 
 
 def load_all_csv_into_db() -> None:
@@ -26,43 +103,32 @@ def load_all_csv_into_db() -> None:
     This avoids inserting the same rows many times.
     """
     data_dir = "DATA"
-    incidents_csv = os.path.join(data_dir, "cyber_incidents.csv")
-    datasets_csv = os.path.join(data_dir, "datasets_metadata.csv")
-    tickets_csv = os.path.join(data_dir, "it_tickets.csv")
-
-    conn = sqlite3.connect(DB_PATH)
-
-    # Cyber incidents
-    if os.path.exists(incidents_csv):
-        if _table_is_empty(conn, "cyber_incidents"):
-            df = pd.read_csv(incidents_csv)
-            df.to_sql("cyber_incidents", conn, if_exists="append", index=False)
-            print("Loaded cyber_incidents.csv into cyber_incidents table.")
-        else:
-            print("cyber_incidents table already has data, skipping CSV load.")
-    else:
-        print("cyber_incidents.csv not found, skipping.")
-
-    # Datasets metadata
-    if os.path.exists(datasets_csv):
-        if _table_is_empty(conn, "datasets_metadata"):
-            df = pd.read_csv(datasets_csv)
-            df.to_sql("datasets_metadata", conn, if_exists="append", index=False)
-            print("Loaded datasets_metadata.csv into datasets_metadata table.")
-        else:
-            print("datasets_metadata table already has data, skipping CSV load.")
-    else:
-        print("datasets_metadata.csv not found, skipping.")
-
-    # IT tickets
-    if os.path.exists(tickets_csv):
-        if _table_is_empty(conn, "it_tickets"):
-            df = pd.read_csv(tickets_csv)
-            df.to_sql("it_tickets", conn, if_exists="append", index=False)
-            print("Loaded it_tickets.csv into it_tickets table.")
+
+    conn = connect_database()
+
+    # One directory listing instead of an exists() check per file
+    try:
+        present = {entry.name for entry in os.scandir(data_dir) if entry.is_file()}
+    except FileNotFoundError:
+        present = set()
+
+    loaded = False
+    for table_name in CSV_TABLES:
+        csv_file = f"{table_name}.csv"
+        csv_path = os.path.join(data_dir, csv_file)
+
+        # Populated tables are skipped before looking for their CSV at all
+        if not _table_is_empty(conn, table_name):
+            print(f"{table_name} table already has data, skipping CSV load.")
+        elif csv_file not in present:
+            print(f"{csv_file} not found, skipping.")
         else:
-            print("it_tickets table already has data, skipping CSV load.")
-    else:
-        print("it_tickets.csv not found, skipping.")
+            count = _load_csv(conn, csv_path, table_name)
+            print(f"Loaded {count} rows from {csv_file} into {table_name} table.")
+            loaded = True
+
+    # Fresh planner statistics (and sqlite_stat1 row counts) after a bulk load
+    if loaded:
+        conn.execute("ANALYZE")
 
     conn.close()
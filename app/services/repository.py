@@ -2,238 +2,162 @@
 Repository pattern implementation
 Centralizes database access and converts rows to entity objects
 Week 11: OOP architecture
+
+Rows come straight from sqlite3 cursors: every SELECT lists its columns in
+the entity's field order, so each row maps onto Entity.from_row(row)
+without going through a DataFrame.
 """
 
-import pandas as pd
 from typing import List
-from app.data.db import connect_database
+from app.data.db import cached_aggregate, pooled_conn
 from app.models.security_incident import SecurityIncident
 from app.models.dataset import Dataset
 from app.models.it_ticket import ITTicket
 
+# SQL kept at module level so each call reuses the same statement text
+# (and hits sqlite3's per-connection prepared-statement cache); LIMIT is a
+# bound parameter so every page size shares one prepared statement.
+# "Latest" is ORDER BY <primary key> DESC: the keys are INTEGER PRIMARY KEY
+# (the rowid), so SQLite reads the table b-tree backwards and stops after
+# LIMIT rows - no sort and no extra index needed.
+# description is nullable; COALESCE hands the entities "" instead of None.
+_SQL_LATEST_INCIDENTS = (
+    "SELECT incident_id, timestamp, severity, category, status, COALESCE(description, '') "
+    "FROM cyber_incidents ORDER BY incident_id DESC LIMIT ?"
+)
+_SQL_LATEST_DATASETS = (
+    "SELECT dataset_id, name, source, size_mb, rows, quality_score, status "
+    "FROM datasets_metadata ORDER BY dataset_id DESC LIMIT ?"
+)
+_SQL_LATEST_TICKETS = (
+    "SELECT ticket_id, created_at, priority, status, assigned_to, title, COALESCE(description, '') "
+    "FROM it_tickets ORDER BY ticket_id DESC LIMIT ?"
+)
+_SQL_INCIDENT_BY_ID = (
+    "SELECT incident_id, timestamp, severity, category, status, COALESCE(description, '') "
+    "FROM cyber_incidents WHERE incident_id = ?"
+)
+_SQL_DATASET_BY_ID = (
+    "SELECT dataset_id, name, source, size_mb, rows, quality_score, status "
+    "FROM datasets_metadata WHERE dataset_id = ?"
+)
+_SQL_TICKET_BY_ID = (
+    "SELECT ticket_id, created_at, priority, status, assigned_to, title, COALESCE(description, '') "
+    "FROM it_tickets WHERE ticket_id = ?"
+)
+
+
+def _cursor_for(conn, entity_cls):
+    """
+    Cursor whose rows come back as entity_cls objects (via from_row).
+
+    The row factory is set on this cursor only; pooled connections keep
+    returning plain tuples to everyone else.
+    """
+    cur = conn.cursor()
+    cur.row_factory = lambda _cursor, row: entity_cls.from_row(row)
+    return cur
+
+
 class Repository:
     """Centralized data access layer using Repository pattern"""
-    
+
     def __init__(self):
-        """Initialize repository"""
-        self.conn = None
-    
+        """
+        Initialize repository
+
+        Queries borrow read-only connections from the shared pool in
+        app.data.db, so no connection is opened (or closed) per call and
+        the page cache stays warm between dashboard refreshes.
+
+        get_latest_* rows are cached per limit until the next write (see
+        cached_aggregate), since dashboards re-request the same page on
+        every rerun.
+        """
+
     def get_latest_incidents(self, limit: int = 50) -> List[SecurityIncident]:
         """
         Get latest security incidents as entity objects
-        
+
         Args:
             limit: Maximum number of incidents to retrieve
-            
+
         Returns:
             List of SecurityIncident objects
         """
         try:
-            conn = connect_database()
-            
-            query = f"""
-            SELECT incident_id, timestamp, severity, category, status, description
-            FROM cyber_incidents
-            ORDER BY incident_id DESC
-            LIMIT {limit}
-            """
-            
-            df = pd.read_sql_query(query, conn)
-            conn.close()
-            
-            incidents = []
-            for _, row in df.iterrows():
-                incident = SecurityIncident(
-                    incident_id=int(row['incident_id']),
-                    timestamp=str(row['timestamp']),
-                    severity=str(row['severity']),
-                    category=str(row['category']),
-                    status=str(row['status']),
-                    description=str(row['description'])
-                )
-                incidents.append(incident)
-            
-            return incidents
-            
+            rows = cached_aggregate("repository.latest_incidents", _SQL_LATEST_INCIDENTS, (int(limit),))
+
+            return [SecurityIncident.from_row(row) for row in rows]
+
         except Exception as e:
             print(f"Error loading incidents: {e}")
             return []
-    
+
     def get_latest_datasets(self, limit: int = 100) -> List[Dataset]:
         """
         Get latest datasets as entity objects
-        
+
         Args:
             limit: Maximum number of datasets to retrieve
-            
+
         Returns:
             List of Dataset objects
         """
         try:
-            conn = connect_database()
-            
-            query = f"""
-            SELECT dataset_id, name, source, size_mb, rows, quality_score, status
-            FROM datasets_metadata
-            ORDER BY dataset_id DESC
-            LIMIT {limit}
-            """
-            
-            df = pd.read_sql_query(query, conn)
-            conn.close()
-            
-            datasets = []
-            for _, row in df.iterrows():
-                dataset = Dataset(
-                    dataset_id=int(row['dataset_id']),
-                    name=str(row['name']),
-                    source=str(row['source']),
-                    size_mb=float(row['size_mb']),
-                    rows=int(row['rows']),
-                    quality_score=float(row['quality_score']),
-                    status=str(row['status'])
-                )
-                datasets.append(dataset)
-            
-            return datasets
-            
+            rows = cached_aggregate("repository.latest_datasets", _SQL_LATEST_DATASETS, (int(limit),))
+
+            return [Dataset.from_row(row) for row in rows]
+
         except Exception as e:
             print(f"Error loading datasets: {e}")
             return []
-    
+
     def get_latest_tickets(self, limit: int = 100) -> List[ITTicket]:
         """
         Get latest IT tickets as entity objects
-        
+
         Args:
             limit: Maximum number of tickets to retrieve
-            
+
         Returns:
             List of ITTicket objects
         """
         try:
-            conn = connect_database()
-            
-            query = f"""
-            SELECT ticket_id, created_at, priority, status, assigned_to, title, description
-            FROM it_tickets
-            ORDER BY ticket_id DESC
-            LIMIT {limit}
-            """
-            
-            df = pd.read_sql_query(query, conn)
-            conn.close()
-            
-            tickets = []
-            for _, row in df.iterrows():
-                ticket = ITTicket(
-                    ticket_id=int(row['ticket_id']),
-                    created_at=str(row['created_at']),
-                    priority=str(row['priority']),
-                    status=str(row['status']),
-                    assigned_to=str(row['assigned_to']),
-                    title=str(row['title']),
-                    description=str(row['description'])
-                )
-                tickets.append(ticket)
-            
-            return tickets
-            
+            rows = cached_aggregate("repository.latest_tickets", _SQL_LATEST_TICKETS, (int(limit),))
+
+            return [ITTicket.from_row(row) for row in rows]
+
         except Exception as e:
             print(f"Error loading tickets: {e}")
             return []
-    
+
     def get_incident_by_id(self, incident_id: int) -> SecurityIncident:
         """Get specific incident by ID"""
         try:
-            conn = connect_database()
-            
-            query = """
-            SELECT incident_id, timestamp, severity, category, status, description
-            FROM cyber_incidents
-            WHERE incident_id = ?
-            """
-            
-            df = pd.read_sql_query(query, conn, params=(incident_id,))
-            conn.close()
-            
-            if not df.empty:
-                row = df.iloc[0]
-                return SecurityIncident(
-                    incident_id=int(row['incident_id']),
-                    timestamp=str(row['timestamp']),
-                    severity=str(row['severity']),
-                    category=str(row['category']),
-                    status=str(row['status']),
-                    description=str(row['description'])
-                )
-            
-            return None
-            
+            with pooled_conn(readonly=True) as conn:
+                return _cursor_for(conn, SecurityIncident).execute(_SQL_INCIDENT_BY_ID, (incident_id,)).fetchone()
+
         except Exception as e:
             print(f"Error getting incident: {e}")
             return None
-    
+
     def get_dataset_by_id(self, dataset_id: int) -> Dataset:
         """Get specific dataset by ID"""
         try:
-            conn = connect_database()
-            
-            query = """
-            SELECT dataset_id, name, source, size_mb, rows, quality_score, status
-            FROM datasets_metadata
-            WHERE dataset_id = ?
-            """
-            
-            df = pd.read_sql_query(query, conn, params=(dataset_id,))
-            conn.close()
-            
-            if not df.empty:
-                row = df.iloc[0]
-                return Dataset(
-                    dataset_id=int(row['dataset_id']),
-                    name=str(row['name']),
-                    source=str(row['source']),
-                    size_mb=float(row['size_mb']),
-                    rows=int(row['rows']),
-                    quality_score=float(row['quality_score']),
-                    status=str(row['status'])
-                )
-            
-            return None
-            
+            with pooled_conn(readonly=True) as conn:
+                return _cursor_for(conn, Dataset).execute(_SQL_DATASET_BY_ID, (dataset_id,)).fetchone()
+
         except Exception as e:
             print(f"Error getting dataset: {e}")
             return None
-    
+
     def get_ticket_by_id(self, ticket_id: int) -> ITTicket:
         """Get specific ticket by ID"""
         try:
-            conn = connect_database()
-            
-            query = """
-            SELECT ticket_id, created_at, priority, status, assigned_to, title, description
-            FROM it_tickets
-            WHERE ticket_id = ?
-            """
-            
-            df = pd.read_sql_query(query, conn, params=(ticket_id,))
-            conn.close()
-            
-            if not df.empty:
-                row = df.iloc[0]
-                return ITTicket(
-                    ticket_id=int(row['ticket_id']),
-                    created_at=str(row['created_at']),
-                    priority=str(row['priority']),
-                    status=str(row['status']),
-                    assigned_to=str(row['assigned_to']),
-                    title=str(row['title']),
-                    description=str(row['description'])
-                )
-            
-            return None
-            
+            with pooled_conn(readonly=True) as conn:
+                return _cursor_for(conn, ITTicket).execute(_SQL_TICKET_BY_ID, (ticket_id,)).fetchone()
+
         except Exception as e:
             print(f"Error getting ticket: {e}")
             return None
\ No newline at end of file
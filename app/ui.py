@@ -8,9 +8,40 @@ Goal:
 - Avoid repeating code everywhere (cleaner + easier to maintain)
 """
 
+import html
+
 import streamlit as st
 
 
+# Built once at import; every page rerun re-sends this same string
+_GLOBAL_CSS = """
+<style>
+/* Hide Streamlit sidebar + nav */
+[data-testid="stSidebarNav"] {display: none !important;}
+section[data-testid="stSidebar"] {display: none !important;}
+[data-testid="collapsedControl"] {display: none !important;}
+
+/* Hide Streamlit header (top bar) */
+header[data-testid="stHeader"] {display: none !important;}
+
+/* Cleaner spacing */
+.block-container {
+    padding-top: 1.2rem !important;
+    padding-bottom: 2.2rem !important;
+}
+
+/* Simple badge style (user info on the right) */
+.badge{
+    padding:7px 12px;
+    border-radius:999px;
+    border:1px solid rgba(255,255,255,0.10);
+    background: rgba(255,255,255,0.04);
+    font-size: 13px;
+}
+</style>
+"""
+
+
 def inject_global_css() -> None:
     """
     Inject global CSS for the whole app.
@@ -20,115 +51,70 @@ def inject_global_css() -> None:
     - Hides Streamlit default header
     - Adds cleaner padding / spacing
     - Adds a small 'badge' component for the user info
+
+    st.html sends the <style> block as-is (no markdown parsing, unlike
+    st.markdown). It has to run on every rerun: Streamlit redraws the page
+    from scratch, so CSS skipped on a rerun would disappear.
     """
-    st.markdown(
-        """
-        <style>
-        /* Hide Streamlit sidebar + nav */
-        [data-testid="stSidebarNav"] {display: none !important;}
-        section[data-testid="stSidebar"] {display: none !important;}
-        [data-testid="collapsedControl"] {display: none !important;}
-
-        /* Hide Streamlit header (top bar) */
-        header[data-testid="stHeader"] {display: none !important;}
-
-        /* Cleaner spacing */
-        .block-container {
-            padding-top: 1.2rem !important;
-            padding-bottom: 2.2rem !important;
-        }
-
-        /* Simple badge style (user info on the right) */
-        .badge{
-            padding:7px 12px;
-            border-radius:999px;
-            border:1px solid rgba(255,255,255,0.10);
-            background: rgba(255,255,255,0.04);
-            font-size: 13px;
-        }
-
-        /* Nice topbar buttons spacing */
-        .topbar-wrap { margin-bottom: 6px; }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.html(_GLOBAL_CSS)
+
 
+# Topbar buttons, left to right: (label, page name for `active`, page file)
+NAV_PAGES = (
+    ("🛡️ Dashboard", "Dashboard", "pages/02_Dashboard.py"),
+    ("📊 Analytics", "Analytics", "pages/03_Analytics.py"),
+    ("📝 Manage", "Manage", "pages/04_Manage_Data.py"),
+    ("🤖 AI", "AI", "pages/06_AI_Assistant.py"),
+    ("⚙️ Settings", "Settings", "pages/05_Settings.py"),
+)
 
+
+# Badge markup built once at import; only the user fields change per rerun
+_BADGE_HTML = '<div class="badge">👤 {username} · {role}</div>'
+
+
+@st.fragment
 def topbar(active: str) -> None:
     """
     Custom navigation bar (Week 9/10).
 
+    Runs as a fragment: clicking a nav or logout button reruns only the bar
+    (which then switches page), not the whole page body underneath it.
+
     active: name of the current page to highlight the correct button.
 
-    Pages used:
-    - Dashboard (02)
-    - Analytics (03)
-    - Manage (04)
-    - AI (06)
-    - Settings (05)
+    Pages used: see NAV_PAGES (Dashboard, Analytics, Manage, AI, Settings).
 
     Also shows the logged-in user badge + logout button.
     """
     user = st.session_state.get("user_info", {"username": "User", "role": "user"})
 
-    st.markdown('<div class="topbar-wrap"></div>', unsafe_allow_html=True)
-
     left, right = st.columns([7, 3])
 
     # LEFT: navigation buttons
     with left:
-        c1, c2, c3, c4, c5 = st.columns(5)
-
-        with c1:
-            if st.button(
-                "🛡️ Dashboard",
-                use_container_width=True,
-                type="primary" if active == "Dashboard" else "secondary",
-            ):
-                st.switch_page("pages/02_Dashboard.py")
-
-        with c2:
-            if st.button(
-                "📊 Analytics",
-                use_container_width=True,
-                type="primary" if active == "Analytics" else "secondary",
-            ):
-                st.switch_page("pages/03_Analytics.py")
-
-        with c3:
-            if st.button(
-                "📝 Manage",
-                use_container_width=True,
-                type="primary" if active == "Manage" else "secondary",
-            ):
-                st.switch_page("pages/04_Manage_Data.py")
-
-        with c4:
-            if st.button(
-                "🤖 AI",
-                use_container_width=True,
-                type="primary" if active == "AI" else "secondary",
-            ):
-                st.switch_page("pages/06_AI_Assistant.py")
-
-        with c5:
-            if st.button(
-                "⚙️ Settings",
-                use_container_width=True,
-                type="primary" if active == "Settings" else "secondary",
-            ):
-                st.switch_page("pages/05_Settings.py")
+        for col, (label, name, page) in zip(st.columns(len(NAV_PAGES)), NAV_PAGES):
+            with col:
+                if st.button(
+                    label,
+                    key=f"nav_{name}",
+                    use_container_width=True,
+                    type="primary" if active == name else "secondary",
+                ):
+                    st.switch_page(page)
 
     # RIGHT: user badge + logout
     with right:
         r1, r2 = st.columns([2, 1])
 
         with r1:
-            st.markdown(
-                f'<div class="badge">👤 {user["username"]} · {user["role"]}</div>',
-                unsafe_allow_html=True,
-            )
+            # st.html: plain HTML, no markdown parsing on every rerun.
+            # Stays in the page (not an iframe) so the global .badge CSS applies;
+            # names are escaped because st.html does not sanitise them.
+            st.html(_BADGE_HTML.format(
+                username=html.escape(str(user["username"])),
+                role=html.escape(str(user["role"])),
+            ))
 
         with r2:
             if st.button("🚪", help="Logout", use_container_width=True):
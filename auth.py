@@ -9,7 +9,6 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.data.db import get_connection
 from app.services.user_service import login, register_user
 
 st.set_page_config(
@@ -53,7 +52,11 @@ st.write("")
 # Create tabs for login and registration
 tab1, tab2 = st.tabs(["Sign In", "Create Account"])
 
-with tab1:
+# Each tab is a fragment: submitting one form reruns only that tab, not the
+# whole page (st.rerun() after a successful login still reruns the app)
+@st.fragment
+def _login_tab():
+    """Sign In tab: login form + test accounts"""
     st.write("### Login to Your Account")
     
     with st.form("login_form"):
@@ -67,9 +70,7 @@ with tab1:
                 st.error("Please fill in all fields")
             else:
                 try:
-                    conn = get_connection()
-                    success, message, user_data = login(conn, username, password)
-                    conn.close()
+                    success, message, user_data = login(username, password)
                     
                     if success:
                         # Login successful
@@ -92,7 +93,10 @@ with tab1:
     - Username: user, Password: user123
     """)
 
-with tab2:
+
+@st.fragment
+def _register_tab():
+    """Create Account tab: registration form"""
     st.write("### Create a New Account")
     
     with st.form("register_form"):
@@ -113,9 +117,7 @@ with tab2:
                 st.error("Password must be at least 6 characters")
             else:
                 try:
-                    conn = get_connection()
-                    success, message = register_user(conn, new_user, new_pass, user_role)
-                    conn.close()
+                    success, message = register_user(new_user, new_pass, user_role)
                     
                     if success:
                         st.success(message)
@@ -126,6 +128,13 @@ with tab2:
                 except Exception as e:
                     st.error(f"Registration failed: {str(e)}")
 
+
+with tab1:
+    _login_tab()
+
+with tab2:
+    _register_tab()
+
 st.write("")
 st.write("---")
 st.caption("CST1510 Coursework 2 - Multi-Domain Intelligence Platform")
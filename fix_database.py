@@ -11,11 +11,11 @@ Run this ONCE to fix the schema mismatch errors you're seeing.
 WARNING: This will delete existing data and reload from CSV files!
 """
 
+import csv
 import sys
+from itertools import islice
 from pathlib import Path
 import sqlite3
-import pandas as pd
-import shutil
 from datetime import datetime
 
 # Add project root to path
@@ -31,7 +31,15 @@ def backup_database():
     """Create a backup of the current database."""
     if DB_PATH.exists():
         backup_path = DB_PATH.parent / f"intelligence_platform_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-        shutil.copy2(DB_PATH, backup_path)
+        # Use SQLite's online backup instead of copying the file: in WAL mode
+        # recent commits may still be in the -wal file, not the .db itself
+        src = sqlite3.connect(DB_PATH)
+        dst = sqlite3.connect(backup_path)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
         print(f"✅ Database backed up to: {backup_path}")
     else:
         print("ℹ️  No existing database to backup")
@@ -47,6 +55,8 @@ def drop_all_tables():
     cur.execute("DROP TABLE IF EXISTS cyber_incidents")
     cur.execute("DROP TABLE IF EXISTS datasets_metadata")
     cur.execute("DROP TABLE IF EXISTS it_tickets")
+    cur.execute("DROP TABLE IF EXISTS lockouts")
+    cur.execute("DROP TABLE IF EXISTS sessions")
     
     conn.commit()
     conn.close()
@@ -61,6 +71,8 @@ def create_correct_schema():
     - datasets_metadata now has: source, size_mb, quality_score, status
     - it_tickets now has: title column
     """
+    from app.data.schema import create_auth_tables
+    
     conn = connect_database()
     cur = conn.cursor()
     
@@ -76,6 +88,9 @@ def create_correct_schema():
         )
     """)
     
+    # Login lockouts + session tokens (were DATA/lockouts.txt / sessions.txt)
+    create_auth_tables(cur)
+    
     # Cyber incidents (this one was already correct)
     cur.execute("""
         CREATE TABLE IF NOT EXISTS cyber_incidents (
@@ -119,6 +134,80 @@ def create_correct_schema():
     print("✅ Tables created with correct schema")
 
 
+# Rows read from a CSV and inserted per executemany() call
+CSV_CHUNKSIZE = 50_000
+
+
+def _estimate_size_mb(row):
+    """size_mb estimate from the row count (0 if unknown)."""
+    try:
+        return float(row.get('rows') or 0) * 0.001
+    except ValueError:
+        return 0.0
+
+
+def _ticket_title(row):
+    """Create title from description or use default."""
+    description = row.get('description')
+    return description[:50] + "..." if description else "Support Request"
+
+
+# Values for columns a CSV does not have: column -> function(row dict)
+DATASET_DEFAULTS = {
+    'source': lambda row: 'Unknown',
+    'size_mb': _estimate_size_mb,
+    'quality_score': lambda row: 0.75,  # default good quality
+    'status': lambda row: 'active',
+}
+TICKET_DEFAULTS = {
+    'title': _ticket_title,
+}
+
+
+def _csv_to_sql(csv_path, table_name, conn, defaults=None):
+    """
+    Stream a CSV into an existing table, CSV_CHUNKSIZE rows at a time.
+
+    Rows are read with the csv module (one chunk in memory at a time) and
+    inserted with executemany inside one transaction, into the table
+    created by create_correct_schema. CSV columns the table does not have
+    are skipped; empty cells become NULL. defaults fills columns the CSV is
+    missing (see DATASET_DEFAULTS). Returns the number of rows loaded.
+    """
+    table_cols = [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
+    
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        keep = [i for i, col in enumerate(header) if col in table_cols]
+        fill = {
+            col: make for col, make in (defaults or {}).items()
+            if col in table_cols and col not in header
+        }
+        cols = [header[i] for i in keep] + list(fill)
+        sql = f"INSERT INTO {table_name} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+        
+        def rows():
+            for raw in reader:
+                values = [raw[i] or None for i in keep]
+                if fill:
+                    record = dict(zip(header, raw))
+                    values.extend(make(record) for make in fill.values())
+                yield values
+        
+        total = 0
+        stream = rows()
+        with conn:
+            conn.execute(f"DELETE FROM {table_name}")
+            while True:
+                chunk = list(islice(stream, CSV_CHUNKSIZE))
+                if not chunk:
+                    break
+                conn.executemany(sql, chunk)
+                total += len(chunk)
+    return total
+
+
 def load_sample_data():
     """Load data from CSV files into the database."""
     conn = connect_database()
@@ -131,9 +220,8 @@ def load_sample_data():
     try:
         incidents_csv = data_dir / "cyber_incidents.csv"
         if incidents_csv.exists():
-            df = pd.read_csv(incidents_csv)
-            df.to_sql("cyber_incidents", conn, if_exists="replace", index=False)
-            print(f"✅ Loaded {len(df)} cyber incidents")
+            count = _csv_to_sql(incidents_csv, "cyber_incidents", conn)
+            print(f"✅ Loaded {count} cyber incidents")
         else:
             print(f"⚠️  File not found: {incidents_csv}")
     except Exception as e:
@@ -143,25 +231,8 @@ def load_sample_data():
     try:
         datasets_csv = data_dir / "datasets_metadata.csv"
         if datasets_csv.exists():
-            df = pd.read_csv(datasets_csv)
-            
-            # Make sure we have all required columns
-            required_cols = ['dataset_id', 'name', 'source', 'size_mb', 'rows', 'quality_score', 'status']
-            
-            # Add missing columns with defaults if needed
-            for col in required_cols:
-                if col not in df.columns:
-                    if col == 'source':
-                        df[col] = 'Unknown'
-                    elif col == 'size_mb':
-                        df[col] = df.get('rows', 0) * 0.001  # estimate from rows
-                    elif col == 'quality_score':
-                        df[col] = 0.75  # default good quality
-                    elif col == 'status':
-                        df[col] = 'active'
-            
-            df[required_cols].to_sql("datasets_metadata", conn, if_exists="replace", index=False)
-            print(f"✅ Loaded {len(df)} datasets")
+            count = _csv_to_sql(datasets_csv, "datasets_metadata", conn, DATASET_DEFAULTS)
+            print(f"✅ Loaded {count} datasets")
         else:
             print(f"⚠️  File not found: {datasets_csv}")
     except Exception as e:
@@ -171,18 +242,8 @@ def load_sample_data():
     try:
         tickets_csv = data_dir / "it_tickets.csv"
         if tickets_csv.exists():
-            df = pd.read_csv(tickets_csv)
-            
-            # Make sure we have the 'title' column
-            if 'title' not in df.columns:
-                # Create title from description or use default
-                if 'description' in df.columns:
-                    df['title'] = df['description'].str[:50] + "..."
-                else:
-                    df['title'] = "Support Request"
-            
-            df.to_sql("it_tickets", conn, if_exists="replace", index=False)
-            print(f"✅ Loaded {len(df)} IT tickets")
+            count = _csv_to_sql(tickets_csv, "it_tickets", conn, TICKET_DEFAULTS)
+            print(f"✅ Loaded {count} IT tickets")
         else:
             print(f"⚠️  File not found: {tickets_csv}")
     except Exception as e:
@@ -191,27 +252,37 @@ def load_sample_data():
     conn.close()
 
 
+def build_indexes():
+    """Recreate the app's indexes (dropped with the tables) and refresh statistics."""
+    from app.data.schema import create_indexes
+    
+    print("📇 Building indexes...")
+    create_indexes()
+    print("✅ Indexes created")
+
+
 def load_default_users():
     """Create default test users with bcrypt hashed passwords."""
     try:
-        import bcrypt
-        from app.data.users import create_user
+        from app.data.users import create_users_many
+        from app.services.user_service import hash_password
         
         print("👤 Creating default users...")
         
-        conn = connect_database()
-        
-        # Admin user
-        create_user(conn, "admin", "admin123", "admin")
-        
-        # Analyst user
-        create_user(conn, "analyst", "analyst123", "analyst")
+        # (username, password, role): admin, analyst and a regular user
+        default_users = [
+            ("admin", "admin123", "admin"),
+            ("analyst", "analyst123", "analyst"),
+            ("user", "user123", "user"),
+        ]
+        rows = [
+            (username, hash_password(password), role)
+            for username, password, role in default_users
+        ]
         
-        # Regular user
-        create_user(conn, "user", "user123", "user")
-        
-        conn.close()
-        print("✅ Default users created")
+        # One transaction for all users; existing usernames are left alone
+        created = create_users_many(rows)
+        print(f"✅ Default users created ({created} new)")
         
     except Exception as e:
         print(f"⚠️  Could not create users: {e}")
@@ -283,11 +354,15 @@ def main():
     load_sample_data()
     print()
     
-    # Step 5: Create users
+    # Step 5: Indexes + planner statistics (built after the bulk load)
+    build_indexes()
+    print()
+    
+    # Step 6: Create users
     load_default_users()
     print()
     
-    # Step 6: Verify
+    # Step 7: Verify
     verify_schema()
     print()
     
@@ -35,30 +35,75 @@ st.markdown("---")
 st.write("### 📊 System Overview")
 st.write("")
 
+# Tables at least this big show the row count recorded by the last ANALYZE
+# (sqlite_stat1) instead of an exact COUNT(*), which has to scan the table
+APPROX_COUNT_MIN_ROWS = 100_000
+
+
+def estimated_row_counts(conn) -> dict:
+    """
+    table -> rows seen by the last ANALYZE ({} if it never ran).
+    sqlite_stat1.stat starts with the row count, so CAST keeps just that.
+    """
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is None:
+        return {}
+    return dict(conn.execute("SELECT tbl, MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 GROUP BY tbl"))
+
+
+@st.cache_data(show_spinner=False, ttl=60)
+def load_overview_counts(generation: int = 0):
+    """
+    (incidents, active incidents, datasets, tickets, approximate tables).
+    Cached until the next write (generation); the ttl also picks up writes
+    made outside the pooled connections.
+    """
+    from app.data.db import pooled_conn
+    # Borrowed from the shared read-only pool: no connect/PRAGMA setup per call
+    with pooled_conn(readonly=True) as conn:
+        large = {
+            table: rows for table, rows in estimated_row_counts(conn).items()
+            if rows >= APPROX_COUNT_MIN_ROWS
+        }
+        if not large:
+            # All four metrics in one statement: one execute/fetch, not four.
+            # Total and active incidents come from the same single pass over
+            # cyber_incidents (SUM of a 0/1 comparison, COALESCE for an empty table).
+            row = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(status != 'Resolved'), 0), "
+                "(SELECT COUNT(*) FROM datasets_metadata), "
+                "(SELECT COUNT(*) FROM it_tickets) "
+                "FROM cyber_incidents"
+            ).fetchone()
+            return (*row, ())
+
+        def total(table):
+            if table in large:
+                return large[table]
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+        # Active incidents stay exact: the count reads the partial
+        # idx_incidents_unresolved index, not the whole table
+        active = conn.execute(
+            "SELECT COUNT(*) FROM cyber_incidents WHERE status != 'Resolved'"
+        ).fetchone()[0]
+        # The estimate misses rows added since the last ANALYZE, so it can
+        # fall below the exact active count; never show fewer than that
+        incidents = max(total("cyber_incidents"), active)
+        return incidents, active, total("datasets_metadata"), total("it_tickets"), tuple(large)
+
 try:
-    from app.data.db import connect_database
-    conn = connect_database()
-    cursor = conn.cursor()
+    from app.data.db import write_generation
+    incidents, active, datasets, tickets, approximate = load_overview_counts(write_generation())
+
+    def shown(table, count):
+        """Estimated totals (tables over APPROX_COUNT_MIN_ROWS) are marked with ~."""
+        return f"~{count:,}" if table in approximate else count
     
     col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        cursor.execute("SELECT COUNT(*) FROM cyber_incidents")
-        st.metric("🛡️ Security Incidents", cursor.fetchone()[0])
-    
-    with col2:
-        cursor.execute("SELECT COUNT(*) FROM cyber_incidents WHERE status != 'Resolved'")
-        st.metric("⚠️ Active Incidents", cursor.fetchone()[0])
-    
-    with col3:
-        cursor.execute("SELECT COUNT(*) FROM datasets_metadata")
-        st.metric("📁 Datasets", cursor.fetchone()[0])
-    
-    with col4:
-        cursor.execute("SELECT COUNT(*) FROM it_tickets")
-        st.metric("🎫 IT Tickets", cursor.fetchone()[0])
-    
-    conn.close()
+    col1.metric("🛡️ Security Incidents", shown("cyber_incidents", incidents))
+    col2.metric("⚠️ Active Incidents", active)
+    col3.metric("📁 Datasets", shown("datasets_metadata", datasets))
+    col4.metric("🎫 IT Tickets", shown("it_tickets", tickets))
     
 except Exception as e:
     st.error(f"Error loading metrics: {str(e)}")
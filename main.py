@@ -14,8 +14,6 @@ from pathlib import Path
 # Allow imports from project root
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.ui import inject_global_css
-
 st.set_page_config(
     page_title="Intelligence Platform",
     page_icon="📊",
@@ -23,8 +21,8 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Apply global CSS for the whole app
-inject_global_css()
+# No global CSS here: this script always switches page below, and every
+# target page injects it itself (app.ui.inject_global_css)
 
 # Initialize session state (auth)
 if "logged_in" not in st.session_state:
@@ -36,9 +34,7 @@ if "user_info" not in st.session_state:
 # -------------------------------
 # Redirect logic (important!)
 # -------------------------------
-# If not logged in: always go to Login page first
-if not st.session_state.logged_in:
-    st.switch_page("pages/01_Login.py")
-
-# If logged in: send user to the main “menu” page (Dashboard)
-st.switch_page("pages/02_Dashboard.py")
+# One switch_page per run: Login if not logged in, otherwise the main
+# "menu" page (Dashboard). switch_page stops this script immediately.
+target = "pages/02_Dashboard.py" if st.session_state.logged_in else "pages/01_Login.py"
+st.switch_page(target)
@@ -28,6 +28,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.ui import inject_global_css, topbar, auth_guard
 from app.services.repository import Repository
+from app.data.db import write_generation
 
 
 # -----------------------------
@@ -58,13 +59,13 @@ st.markdown("---")
 repo = Repository()
 
 @st.cache_data(show_spinner=False, ttl=60)
-def load_datasets(limit: int = 200):
-    """Load dataset objects from Repository. Cached to improve performance."""
+def load_datasets(limit: int = 200, generation: int = 0):
+    """Load dataset objects from Repository. Cached until the next write (generation)."""
     return repo.get_latest_datasets(limit=limit)
 
 @st.cache_data(show_spinner=False, ttl=60)
-def load_tickets(limit: int = 300):
-    """Load ticket objects from Repository. Cached to improve performance."""
+def load_tickets(limit: int = 300, generation: int = 0):
+    """Load ticket objects from Repository. Cached until the next write (generation)."""
     return repo.get_latest_tickets(limit=limit)
 
 
@@ -112,7 +113,7 @@ if domain == "📊 Data Science":
 
     # Load datasets once (cached)
     with st.spinner("Loading dataset analytics..."):
-        datasets = load_datasets(limit=200)
+        datasets = load_datasets(limit=200, generation=write_generation())
 
     # If no data, stop gracefully
     if not datasets:
@@ -342,7 +343,7 @@ else:
     st.write("Service desk performance and bottleneck analysis")
 
     with st.spinner("Loading IT ticket analytics..."):
-        tickets = load_tickets(limit=300)
+        tickets = load_tickets(limit=300, generation=write_generation())
 
     if not tickets:
         st.info("No tickets found in database.")
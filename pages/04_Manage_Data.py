@@ -13,6 +13,7 @@ Week 11: OOP integration with entity classes
 import streamlit as st
 import pandas as pd
 import sys
+import sqlite3
 from pathlib import Path
 from datetime import datetime
 
@@ -20,6 +21,7 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.ui import inject_global_css, topbar, auth_guard
+from app.data.db import write_generation
 from app.data.incidents import (
     get_all_incidents,
     get_incident_by_id,
@@ -80,9 +82,9 @@ if domain == "🛡️ Cybersecurity Incidents":
     st.header("🛡️ Cybersecurity Incidents")
     
     # Load data function with caching
-    @st.cache_data(ttl=5)
-    def load_incidents_df():
-        """Load incidents as DataFrame"""
+    @st.cache_data(ttl=60)
+    def load_incidents_df(generation):
+        """Load incidents as DataFrame (cached until the next write, see write_generation)"""
         rows = get_all_incidents()
         if rows:
             return pd.DataFrame(
@@ -98,7 +100,7 @@ if domain == "🛡️ Cybersecurity Incidents":
     with tab1:
         st.subheader("📋 All Security Incidents")
         
-        df = load_incidents_df()
+        df = load_incidents_df(write_generation())
         
         if not df.empty:
             # Metrics
@@ -184,14 +186,13 @@ if domain == "🛡️ Cybersecurity Incidents":
             
             if submitted:
                 if timestamp and severity and category and status and description:
-                    success = create_incident(timestamp, severity, category, status, description)
-                    
-                    if success:
+                    try:
+                        create_incident(timestamp, severity, category, status, description)
+                    except sqlite3.Error as e:
+                        st.error(f"❌ Failed to create incident: {e}")
+                    else:
                         st.success(f"✅ Incident created successfully!")
-                        st.cache_data.clear()
                         st.rerun()
-                    else:
-                        st.error("❌ Failed to create incident")
                 else:
                     st.warning("⚠️ Please fill all required fields")
     
@@ -199,11 +200,11 @@ if domain == "🛡️ Cybersecurity Incidents":
     with tab3:
         st.subheader("✏️ Update Incident")
         
-        df = load_incidents_df()
+        df = load_incidents_df(write_generation())
         
         if not df.empty:
-            incident_options = {f"{row['ID']} - {row['Category']} ({row['Severity']})": row['ID'] 
-                              for _, row in df.iterrows()}
+            incident_options = {f"{i} - {category} ({severity})": i
+                              for i, category, severity in zip(df['ID'].tolist(), df['Category'].tolist(), df['Severity'].tolist())}
             
             selected = st.selectbox(
                 "Select Incident to Update:",
@@ -218,7 +219,7 @@ if domain == "🛡️ Cybersecurity Incidents":
                     with st.form("update_incident_form"):
                         st.write(f"**Updating Incident ID: {incident_id}**")
                         
-                        timestamp = st.text_input("Timestamp*", value=incident[1])
+                        timestamp = st.text_input("Timestamp*", value=incident["timestamp"])
                         
                         col1, col2 = st.columns(2)
                         
@@ -226,36 +227,35 @@ if domain == "🛡️ Cybersecurity Incidents":
                             severity = st.selectbox(
                                 "Severity*",
                                 ["Critical", "High", "Medium", "Low"],
-                                index=["Critical", "High", "Medium", "Low"].index(incident[2])
+                                index=["Critical", "High", "Medium", "Low"].index(incident["severity"])
                             )
                             category = st.selectbox(
                                 "Category*",
                                 ["Phishing", "Malware", "DDoS", "Insider Threat", "Data Breach", "Other"],
-                                index=["Phishing", "Malware", "DDoS", "Insider Threat", "Data Breach", "Other"].index(incident[3])
-                                      if incident[3] in ["Phishing", "Malware", "DDoS", "Insider Threat", "Data Breach", "Other"] else 0
+                                index=["Phishing", "Malware", "DDoS", "Insider Threat", "Data Breach", "Other"].index(incident["category"])
+                                      if incident["category"] in ["Phishing", "Malware", "DDoS", "Insider Threat", "Data Breach", "Other"] else 0
                             )
                         
                         with col2:
                             status = st.selectbox(
                                 "Status*",
                                 ["Open", "In Progress", "Resolved", "Closed"],
-                                index=["Open", "In Progress", "Resolved", "Closed"].index(incident[4])
-                                      if incident[4] in ["Open", "In Progress", "Resolved", "Closed"] else 0
+                                index=["Open", "In Progress", "Resolved", "Closed"].index(incident["status"])
+                                      if incident["status"] in ["Open", "In Progress", "Resolved", "Closed"] else 0
                             )
                         
-                        description = st.text_area("Description*", value=incident[5], height=100)
+                        description = st.text_area("Description*", value=incident["description"], height=100)
                         
                         submitted = st.form_submit_button("💾 Update Incident", use_container_width=True)
                         
                         if submitted:
-                            success = update_incident(incident_id, timestamp, severity, category, status, description)
-                            
-                            if success:
+                            try:
+                                update_incident(incident_id, timestamp, severity, category, status, description)
+                            except sqlite3.Error as e:
+                                st.error(f"❌ Update failed: {e}")
+                            else:
                                 st.success(f"✅ Incident {incident_id} updated!")
-                                st.cache_data.clear()
                                 st.rerun()
-                            else:
-                                st.error("❌ Update failed")
         else:
             st.info("No incidents available to update")
     
@@ -263,11 +263,11 @@ if domain == "🛡️ Cybersecurity Incidents":
     with tab4:
         st.subheader("🗑️ Delete Incident")
         
-        df = load_incidents_df()
+        df = load_incidents_df(write_generation())
         
         if not df.empty:
-            incident_options = {f"{row['ID']} - {row['Category']} ({row['Severity']})": row['ID'] 
-                              for _, row in df.iterrows()}
+            incident_options = {f"{i} - {category} ({severity})": i
+                              for i, category, severity in zip(df['ID'].tolist(), df['Category'].tolist(), df['Severity'].tolist())}
             
             selected = st.selectbox(
                 "Select Incident to Delete:",
@@ -284,25 +284,24 @@ if domain == "🛡️ Cybersecurity Incidents":
                     
                     col1, col2 = st.columns(2)
                     with col1:
-                        st.write(f"**Category:** {incident[3]}")
-                        st.write(f"**Severity:** {incident[2]}")
+                        st.write(f"**Category:** {incident['category']}")
+                        st.write(f"**Severity:** {incident['severity']}")
                     with col2:
-                        st.write(f"**Status:** {incident[4]}")
-                        st.write(f"**Date:** {incident[1]}")
+                        st.write(f"**Status:** {incident['status']}")
+                        st.write(f"**Date:** {incident['timestamp']}")
                     
-                    st.write(f"**Description:** {incident[5]}")
+                    st.write(f"**Description:** {incident['description']}")
                     
                     st.error("⚠️ This action cannot be undone!")
                     
                     if st.button("🗑️ Confirm Delete", type="primary", use_container_width=True):
-                        success = delete_incident(incident_id)
-                        
-                        if success:
+                        try:
+                            delete_incident(incident_id)
+                        except sqlite3.Error as e:
+                            st.error(f"❌ Delete failed: {e}")
+                        else:
                             st.success(f"✅ Incident {incident_id} deleted!")
-                            st.cache_data.clear()
                             st.rerun()
-                        else:
-                            st.error("❌ Delete failed")
         else:
             st.info("No incidents available to delete")
 
@@ -313,9 +312,9 @@ elif domain == "📊 Datasets":
     st.header("📊 Datasets")
     
     # Load data function with caching
-    @st.cache_data(ttl=5)
-    def load_datasets_df():
-        """Load datasets as DataFrame"""
+    @st.cache_data(ttl=60)
+    def load_datasets_df(generation):
+        """Load datasets as DataFrame (cached until the next write, see write_generation)"""
         rows = get_all_datasets()
         if rows:
             return pd.DataFrame(
@@ -331,7 +330,7 @@ elif domain == "📊 Datasets":
     with tab1:
         st.subheader("📋 All Datasets")
         
-        df = load_datasets_df()
+        df = load_datasets_df(write_generation())
         
         if not df.empty:
             # Metrics
@@ -401,14 +400,13 @@ elif domain == "📊 Datasets":
             
             if submitted:
                 if name and source:
-                    success = create_dataset(name, source, size_mb, rows, quality_score, status)
-                    
-                    if success:
+                    try:
+                        create_dataset(name, source, size_mb, rows, quality_score, status)
+                    except sqlite3.Error as e:
+                        st.error(f"❌ Failed to create dataset: {e}")
+                    else:
                         st.success(f"✅ Dataset '{name}' created successfully!")
-                        st.cache_data.clear()
                         st.rerun()
-                    else:
-                        st.error("❌ Failed to create dataset")
                 else:
                     st.warning("⚠️ Please fill all required fields")
     
@@ -416,11 +414,11 @@ elif domain == "📊 Datasets":
     with tab3:
         st.subheader("✏️ Update Dataset")
         
-        df = load_datasets_df()
+        df = load_datasets_df(write_generation())
         
         if not df.empty:
-            dataset_options = {f"{row['ID']} - {row['Name']}": row['ID'] 
-                             for _, row in df.iterrows()}
+            dataset_options = {f"{i} - {name}": i
+                             for i, name in zip(df['ID'].tolist(), df['Name'].tolist())}
             
             selected = st.selectbox(
                 "Select Dataset to Update:",
@@ -435,39 +433,38 @@ elif domain == "📊 Datasets":
                     with st.form("update_dataset_form"):
                         st.write(f"**Updating Dataset ID: {dataset_id}**")
                         
-                        name = st.text_input("Dataset Name*", value=dataset[1])
+                        name = st.text_input("Dataset Name*", value=dataset["name"])
                         
                         col1, col2 = st.columns(2)
                         with col1:
                             source = st.selectbox(
                                 "Source*",
                                 ["IT Department", "Cybersecurity", "Data Science", "Finance", "HR", "Other"],
-                                index=["IT Department", "Cybersecurity", "Data Science", "Finance", "HR", "Other"].index(dataset[2]) 
-                                      if dataset[2] in ["IT Department", "Cybersecurity", "Data Science", "Finance", "HR", "Other"] else 0
+                                index=["IT Department", "Cybersecurity", "Data Science", "Finance", "HR", "Other"].index(dataset["source"]) 
+                                      if dataset["source"] in ["IT Department", "Cybersecurity", "Data Science", "Finance", "HR", "Other"] else 0
                             )
-                            size_mb = st.number_input("Size (MB)*", value=float(dataset[3]), min_value=0.1, step=10.0)
+                            size_mb = st.number_input("Size (MB)*", value=float(dataset["size_mb"]), min_value=0.1, step=10.0)
                         
                         with col2:
-                            rows = st.number_input("Rows*", value=int(dataset[4]), min_value=1, step=100)
-                            quality_score = st.slider("Quality Score", value=float(dataset[5]), min_value=0.0, max_value=1.0, step=0.1)
+                            rows = st.number_input("Rows*", value=int(dataset["rows"]), min_value=1, step=100)
+                            quality_score = st.slider("Quality Score", value=float(dataset["quality_score"]), min_value=0.0, max_value=1.0, step=0.1)
                         
                         status = st.selectbox(
                             "Status",
                             ["Active", "Archived"],
-                            index=0 if dataset[6] == "Active" else 1
+                            index=0 if dataset["status"] == "Active" else 1
                         )
                         
                         submitted = st.form_submit_button("💾 Update Dataset", use_container_width=True)
                         
                         if submitted:
-                            success = update_dataset(dataset_id, name, source, size_mb, rows, quality_score, status)
-                            
-                            if success:
+                            try:
+                                update_dataset(dataset_id, name, source, size_mb, rows, quality_score, status)
+                            except sqlite3.Error as e:
+                                st.error(f"❌ Update failed: {e}")
+                            else:
                                 st.success(f"✅ Dataset '{name}' updated!")
-                                st.cache_data.clear()
                                 st.rerun()
-                            else:
-                                st.error("❌ Update failed")
         else:
             st.info("No datasets available to update")
     
@@ -475,11 +472,11 @@ elif domain == "📊 Datasets":
     with tab4:
         st.subheader("🗑️ Delete Dataset")
         
-        df = load_datasets_df()
+        df = load_datasets_df(write_generation())
         
         if not df.empty:
-            dataset_options = {f"{row['ID']} - {row['Name']}": row['ID'] 
-                             for _, row in df.iterrows()}
+            dataset_options = {f"{i} - {name}": i
+                             for i, name in zip(df['ID'].tolist(), df['Name'].tolist())}
             
             selected = st.selectbox(
                 "Select Dataset to Delete:",
@@ -496,25 +493,24 @@ elif domain == "📊 Datasets":
                     
                     col1, col2 = st.columns(2)
                     with col1:
-                        st.write(f"**Name:** {dataset[1]}")
-                        st.write(f"**Source:** {dataset[2]}")
-                        st.write(f"**Size:** {dataset[3]} MB")
+                        st.write(f"**Name:** {dataset['name']}")
+                        st.write(f"**Source:** {dataset['source']}")
+                        st.write(f"**Size:** {dataset['size_mb']} MB")
                     with col2:
-                        st.write(f"**Rows:** {dataset[4]:,}")
-                        st.write(f"**Quality:** {dataset[5]:.2f}")
-                        st.write(f"**Status:** {dataset[6]}")
+                        st.write(f"**Rows:** {dataset['rows']:,}")
+                        st.write(f"**Quality:** {dataset['quality_score']:.2f}")
+                        st.write(f"**Status:** {dataset['status']}")
                     
                     st.error("⚠️ This action cannot be undone!")
                     
                     if st.button("🗑️ Confirm Delete", type="primary", use_container_width=True):
-                        success = delete_dataset(dataset_id)
-                        
-                        if success:
+                        try:
+                            delete_dataset(dataset_id)
+                        except sqlite3.Error as e:
+                            st.error(f"❌ Delete failed: {e}")
+                        else:
                             st.success(f"✅ Dataset {dataset_id} deleted!")
-                            st.cache_data.clear()
                             st.rerun()
-                        else:
-                            st.error("❌ Delete failed")
         else:
             st.info("No datasets available to delete")
 
@@ -525,9 +521,9 @@ else:  # IT Tickets
     st.header("🎫 IT Support Tickets")
     
     # Load data function with caching
-    @st.cache_data(ttl=5)
-    def load_tickets_df():
-        """Load tickets as DataFrame"""
+    @st.cache_data(ttl=60)
+    def load_tickets_df(generation):
+        """Load tickets as DataFrame (cached until the next write, see write_generation)"""
         rows = get_all_tickets()
         if rows:
             return pd.DataFrame(
@@ -543,7 +539,7 @@ else:  # IT Tickets
     with tab1:
         st.subheader("📋 All Support Tickets")
         
-        df = load_tickets_df()
+        df = load_tickets_df(write_generation())
         
         if not df.empty:
             # Metrics
@@ -635,14 +631,13 @@ else:  # IT Tickets
             
             if submitted:
                 if created_at and priority and status and assigned_to and title and description:
-                    success = create_ticket(created_at, priority, status, assigned_to, title, description)
-                    
-                    if success:
+                    try:
+                        create_ticket(created_at, priority, status, assigned_to, title, description)
+                    except sqlite3.Error as e:
+                        st.error(f"❌ Failed to create ticket: {e}")
+                    else:
                         st.success(f"✅ Ticket created successfully!")
-                        st.cache_data.clear()
                         st.rerun()
-                    else:
-                        st.error("❌ Failed to create ticket")
                 else:
                     st.warning("⚠️ Please fill all required fields")
     
@@ -650,11 +645,11 @@ else:  # IT Tickets
     with tab3:
         st.subheader("✏️ Update Ticket")
         
-        df = load_tickets_df()
+        df = load_tickets_df(write_generation())
         
         if not df.empty:
-            ticket_options = {f"{row['ID']} - {row['Title']} ({row['Priority']})": row['ID'] 
-                            for _, row in df.iterrows()}
+            ticket_options = {f"{i} - {title} ({priority})": i
+                            for i, title, priority in zip(df['ID'].tolist(), df['Title'].tolist(), df['Priority'].tolist())}
             
             selected = st.selectbox(
                 "Select Ticket to Update:",
@@ -669,7 +664,7 @@ else:  # IT Tickets
                     with st.form("update_ticket_form"):
                         st.write(f"**Updating Ticket ID: {ticket_id}**")
                         
-                        created_at = st.text_input("Created At*", value=ticket[1])
+                        created_at = st.text_input("Created At*", value=ticket["created_at"])
                         
                         col1, col2 = st.columns(2)
                         
@@ -677,32 +672,31 @@ else:  # IT Tickets
                             priority = st.selectbox(
                                 "Priority*",
                                 ["Critical", "High", "Medium", "Low"],
-                                index=["Critical", "High", "Medium", "Low"].index(ticket[2])
+                                index=["Critical", "High", "Medium", "Low"].index(ticket["priority"])
                             )
                             status = st.selectbox(
                                 "Status*",
                                 ["Open", "In Progress", "Waiting for User", "Resolved", "Closed"],
-                                index=["Open", "In Progress", "Waiting for User", "Resolved", "Closed"].index(ticket[3])
-                                      if ticket[3] in ["Open", "In Progress", "Waiting for User", "Resolved", "Closed"] else 0
+                                index=["Open", "In Progress", "Waiting for User", "Resolved", "Closed"].index(ticket["status"])
+                                      if ticket["status"] in ["Open", "In Progress", "Waiting for User", "Resolved", "Closed"] else 0
                             )
                         
                         with col2:
-                            assigned_to = st.text_input("Assigned To*", value=ticket[4])
+                            assigned_to = st.text_input("Assigned To*", value=ticket["assigned_to"])
                         
-                        title = st.text_input("Title*", value=ticket[5])
-                        description = st.text_area("Description*", value=ticket[6], height=100)
+                        title = st.text_input("Title*", value=ticket["title"])
+                        description = st.text_area("Description*", value=ticket["description"], height=100)
                         
                         submitted = st.form_submit_button("💾 Update Ticket", use_container_width=True)
                         
                         if submitted:
-                            success = update_ticket(ticket_id, created_at, priority, status, assigned_to, title, description)
-                            
-                            if success:
+                            try:
+                                update_ticket(ticket_id, created_at, priority, status, assigned_to, title, description)
+                            except sqlite3.Error as e:
+                                st.error(f"❌ Update failed: {e}")
+                            else:
                                 st.success(f"✅ Ticket {ticket_id} updated!")
-                                st.cache_data.clear()
                                 st.rerun()
-                            else:
-                                st.error("❌ Update failed")
         else:
             st.info("No tickets available to update")
     
@@ -710,11 +704,11 @@ else:  # IT Tickets
     with tab4:
         st.subheader("🗑️ Delete Ticket")
         
-        df = load_tickets_df()
+        df = load_tickets_df(write_generation())
         
         if not df.empty:
-            ticket_options = {f"{row['ID']} - {row['Title']}": row['ID'] 
-                            for _, row in df.iterrows()}
+            ticket_options = {f"{i} - {title}": i
+                            for i, title in zip(df['ID'].tolist(), df['Title'].tolist())}
             
             selected = st.selectbox(
                 "Select Ticket to Delete:",
@@ -731,26 +725,25 @@ else:  # IT Tickets
                     
                     col1, col2 = st.columns(2)
                     with col1:
-                        st.write(f"**Title:** {ticket[5]}")
-                        st.write(f"**Priority:** {ticket[2]}")
-                        st.write(f"**Status:** {ticket[3]}")
+                        st.write(f"**Title:** {ticket['title']}")
+                        st.write(f"**Priority:** {ticket['priority']}")
+                        st.write(f"**Status:** {ticket['status']}")
                     with col2:
-                        st.write(f"**Assigned To:** {ticket[4]}")
-                        st.write(f"**Created:** {ticket[1]}")
+                        st.write(f"**Assigned To:** {ticket['assigned_to']}")
+                        st.write(f"**Created:** {ticket['created_at']}")
                     
-                    st.write(f"**Description:** {ticket[6]}")
+                    st.write(f"**Description:** {ticket['description']}")
                     
                     st.error("⚠️ This action cannot be undone!")
                     
                     if st.button("🗑️ Confirm Delete", type="primary", use_container_width=True):
-                        success = delete_ticket(ticket_id)
-                        
-                        if success:
+                        try:
+                            delete_ticket(ticket_id)
+                        except sqlite3.Error as e:
+                            st.error(f"❌ Delete failed: {e}")
+                        else:
                             st.success(f"✅ Ticket {ticket_id} deleted!")
-                            st.cache_data.clear()
                             st.rerun()
-                        else:
-                            st.error("❌ Delete failed")
         else:
             st.info("No tickets available to delete")
 
@@ -12,12 +12,11 @@ Features:
 import streamlit as st
 import sys
 from pathlib import Path
-import bcrypt
-import re
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.data.db import connect_database
+from app.services.user_service import check_password, has_digit, has_letter, hash_password
 from app.ui import inject_global_css, topbar, auth_guard
 
 st.set_page_config(page_title="Settings", page_icon="⚙️", layout="centered", initial_sidebar_state="collapsed")
@@ -62,9 +61,9 @@ with st.form("change_password"):
                 errors.append("New password must be at least 6 characters")
             elif len(new_pass) > 50:
                 errors.append("New password must be at most 50 characters")
-            elif not re.search(r"[a-zA-Z]", new_pass):
+            elif not has_letter(new_pass):
                 errors.append("New password must contain at least one letter")
-            elif not re.search(r"[0-9]", new_pass):
+            elif not has_digit(new_pass):
                 errors.append("New password must contain at least one number")
 
         if new_pass and confirm and new_pass != confirm:
@@ -83,11 +82,11 @@ with st.form("change_password"):
                 )
                 user_row = cursor.fetchone()
 
-                if user_row and bcrypt.checkpw(current.encode("utf-8"), user_row[0].encode("utf-8")):
-                    new_hash = bcrypt.hashpw(new_pass.encode("utf-8"), bcrypt.gensalt())
+                if user_row and check_password(current, user_row[0]):
+                    new_hash = hash_password(new_pass)
                     cursor.execute(
                         "UPDATE users SET password_hash = ? WHERE username = ?",
-                        (new_hash.decode("utf-8"), st.session_state.user_info["username"]),
+                        (new_hash, st.session_state.user_info["username"]),
                     )
                     conn.commit()
                     st.success("✅ Password updated!")